@@ -1,16 +1,15 @@
-import base64
-import json
-import os
+import asyncio
 from fastapi import APIRouter
 from fastapi import APIRouter, FastAPI, HTTPException, status, Depends, Header, Query, File, UploadFile, Form
 from typing import Optional, Dict, Any, List
 import logging
 from datetime import datetime, timedelta
-from google.cloud import firestore, storage
+from google.cloud import firestore
+from google.api_core.exceptions import NotFound
 from collections import defaultdict
-from google.oauth2 import  service_account
 from pydantic import BaseModel, EmailStr
 from email_service import email_service
+from util_functions import build_search_tokens, invalidate_item_list_cache, invalidate_item_owner, invalidate_user_profile, migrate_to_keyed_docs, backfill_item_sort_fields
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -21,23 +20,7 @@ admin_router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-try:
-    # Load credentials from base64 env var
-    creds_json = base64.b64decode(os.environ["GOOGLE_APPLICATION_CREDENTIALS"])
-    creds_dict = json.loads(creds_json)
-    credentials = service_account.Credentials.from_service_account_info(creds_dict)
-
-    # Firestore & Storage with credentials
-    db = firestore.Client(credentials=credentials, project=creds_dict["project_id"])
-    storage_client = storage.Client(credentials=credentials, project=creds_dict["project_id"])
-    bucket = storage_client.bucket("sharecare-466314.appspot.com")
-
-    logger.info("Firestore and Storage clients initialized successfully")
-
-except Exception as e:
-    logger.error(f"Failed to initialize clients: {e}")
-    db = None
-    bucket = None
+from database import db
 
 class ApiResponse(BaseModel):
     success: bool
@@ -128,7 +111,7 @@ class SystemSettingsRequest(BaseModel):
     key: str
     value: Any
 
-def create_notification(title: str, message: str, notification_type: str, target_users: List[str] = None, contentId: str = None):
+async def create_notification(title: str, message: str, notification_type: str, target_users: List[str] = None, contentId: str = None):
     """Create notification in database"""
     try:
         notification_data = {
@@ -140,7 +123,7 @@ def create_notification(title: str, message: str, notification_type: str, target
             "contentId":contentId
         }
         
-        db.collection("admin-notifications").add(notification_data)
+        await db.collection("admin-notifications").add(notification_data)
         logger.info(f"Notification created: {title}")
     except Exception as e:
         logger.error(f"Error creating notification: {e}")
@@ -219,7 +202,7 @@ async def get_all_users(
         docs = query.stream()
         users = []
         
-        for doc in docs:
+        async for doc in docs:
             user_data = doc.to_dict()
             user_data["id"] = doc.id
             
@@ -271,7 +254,7 @@ async def update_user_status(
     """Update user active status"""
     try:
         user_ref = db.collection("users").document(user_id)
-        user_doc = user_ref.get()
+        user_doc = await user_ref.get()
         
         if not user_doc.exists:
             raise HTTPException(
@@ -279,10 +262,11 @@ async def update_user_status(
                 detail="User not found"
             )
         
-        user_ref.update({
+        await user_ref.update({
             "is_active": request.is_active,
             "updated_at": datetime.utcnow().isoformat()
         })
+        invalidate_user_profile(user_id)
         
         action = "activated" if request.is_active else "deactivated"
         logger.info(f"User {action}: {user_id}")
@@ -309,7 +293,7 @@ async def delete_user(
     """Delete user account"""
     try:
         user_ref = db.collection("users").document(user_id)
-        user_doc = user_ref.get()
+        user_doc = await user_ref.get()
         
         if not user_doc.exists:
             raise HTTPException(
@@ -327,25 +311,27 @@ async def delete_user(
         except Exception as e:
             logger.error(f"Failed to send deletion confirmation email: {e}")
         
-        user_ref.delete()
+        await user_ref.delete()
+        invalidate_user_profile(user_id)
         
         # Delete user items
         items_query = db.collection("items").where("donor_id", "==", user_id)
         items = items_query.stream()
-        for item in items:
-            item.reference.delete()
+        async for item in items:
+            await item.reference.delete()
+            invalidate_item_owner(item.id)
         
         # Delete user reservations
         reservations_query = db.collection("reservations").where("user_id", "==", user_id)
         reservations = reservations_query.stream()
-        for reservation in reservations:
-            reservation.reference.delete()
+        async for reservation in reservations:
+            await reservation.reference.delete()
         
         # Delete user likes
         likes_query = db.collection("likes").where("user_id", "==", user_id)
         likes = likes_query.stream()
-        for like in likes:
-            like.reference.delete()
+        async for like in likes:
+            await like.reference.delete()
         
         logger.info(f"User deleted successfully: {user_id}")
         
@@ -369,7 +355,7 @@ async def get_admin_statistics():
     try:
         # Get user statistics
         users_ref = db.collection("users")
-        all_users = list(users_ref.stream())
+        all_users = [doc async for doc in users_ref.stream()]
         
         total_users = len(all_users)
         active_users = len([u for u in all_users if u.to_dict().get("is_active", True)])
@@ -380,7 +366,7 @@ async def get_admin_statistics():
         
         # Get item statistics
         items_ref = db.collection("items")
-        all_items = list(items_ref.stream())
+        all_items = [doc async for doc in items_ref.stream()]
         
         total_items = len(all_items)
         available_items = len([i for i in all_items if i.to_dict().get("status") == "available"])
@@ -487,7 +473,7 @@ async def get_all_items(
         docs = query.stream()
         items = []
         
-        for doc in docs:
+        async for doc in docs:
             item_data = doc.to_dict()
             item_data["id"] = doc.id
             
@@ -535,7 +521,7 @@ async def get_item_details(item_id: str):
     """Get detailed item information"""
     try:
         item_ref = db.collection("items").document(item_id)
-        item_doc = item_ref.get()
+        item_doc = await item_ref.get()
         
         if not item_doc.exists:
             raise HTTPException(
@@ -549,7 +535,7 @@ async def get_item_details(item_id: str):
         # Get reservations for this item
         reservations_query = db.collection("reservations").where("item_id", "==", item_id)
         reservations = []
-        for reservation_doc in reservations_query.stream():
+        async for reservation_doc in reservations_query.stream():
             reservation_data = reservation_doc.to_dict()
             reservation_data["id"] = reservation_doc.id
             reservations.append(reservation_data)
@@ -559,7 +545,7 @@ async def get_item_details(item_id: str):
         # Get reports for this item
         reports_query = db.collection("reports").where("item_id", "==", item_id)
         reports = []
-        for report_doc in reports_query.stream():
+        async for report_doc in reports_query.stream():
             report_data = report_doc.to_dict()
             report_data["id"] = report_doc.id
             reports.append(report_data)
@@ -590,7 +576,7 @@ async def update_item(item_id: str, request: UpdateItemRequest):
     """Update item information"""
     try:
         item_ref = db.collection("items").document(item_id)
-        item_doc = item_ref.get()
+        item_doc = await item_ref.get()
         
         if not item_doc.exists:
             raise HTTPException(
@@ -601,6 +587,7 @@ async def update_item(item_id: str, request: UpdateItemRequest):
         update_data = {}
         if request.name:
             update_data["name"] = request.name
+            update_data["name_lower"] = request.name.lower()
         if request.description:
             update_data["description"] = request.description
         if request.category:
@@ -609,10 +596,17 @@ async def update_item(item_id: str, request: UpdateItemRequest):
             update_data["pickup_times"] = request.pickup_times
         if request.expiry_date:
             update_data["expiry_date"] = request.expiry_date
+        if request.name or request.description:
+            item_data = item_doc.to_dict()
+            update_data["search_tokens"] = build_search_tokens(
+                update_data.get("name", item_data.get("name")),
+                update_data.get("description", item_data.get("description"))
+            )
         
         update_data["updated_at"] = datetime.utcnow().isoformat()
         
-        item_ref.update(update_data)
+        await item_ref.update(update_data)
+        invalidate_item_list_cache()
         
         return ApiResponse(
             success=True,
@@ -637,7 +631,7 @@ async def verify_item(
     """Verify item"""
     try:
         item_ref = db.collection("items").document(item_id)
-        item_doc = item_ref.get()
+        item_doc = await item_ref.get()
         
         if not item_doc.exists:
             raise HTTPException(
@@ -645,7 +639,7 @@ async def verify_item(
                 detail="Item not found"
             )
         
-        item_ref.update({
+        await item_ref.update({
             "is_verified": request.is_verified,
             "updated_at": datetime.utcnow().isoformat()
         })
@@ -675,7 +669,7 @@ async def delete_item(
     """Delete item"""
     try:
         item_ref = db.collection("items").document(item_id)
-        item_doc = item_ref.get()
+        item_doc = await item_ref.get()
         
         if not item_doc.exists:
             raise HTTPException(
@@ -686,16 +680,18 @@ async def delete_item(
         # Delete related reservations
         reservations_query = db.collection("reservations").where("item_id", "==", item_id)
         reservations = reservations_query.stream()
-        for reservation in reservations:
-            reservation.reference.delete()
+        async for reservation in reservations:
+            await reservation.reference.delete()
         
         # Delete related likes
         likes_query = db.collection("likes").where("item_id", "==", item_id)
         likes = likes_query.stream()
-        for like in likes:
-            like.reference.delete()
+        async for like in likes:
+            await like.reference.delete()
         
-        item_ref.delete()
+        await item_ref.delete()
+        invalidate_item_list_cache()
+        invalidate_item_owner(item_id)
         
         logger.info(f"Item deleted successfully: {item_id}")
         
@@ -725,26 +721,29 @@ async def bulk_delete_items(
         for item_id in request.item_ids:
             try:
                 item_ref = db.collection("items").document(item_id)
-                item_doc = item_ref.get()
+                item_doc = await item_ref.get()
                 
                 if item_doc.exists:
                     # Delete related data
                     reservations_query = db.collection("reservations").where("item_id", "==", item_id)
                     reservations = reservations_query.stream()
-                    for reservation in reservations:
-                        reservation.reference.delete()
+                    async for reservation in reservations:
+                        await reservation.reference.delete()
                     
                     likes_query = db.collection("likes").where("item_id", "==", item_id)
                     likes = likes_query.stream()
-                    for like in likes:
-                        like.reference.delete()
+                    async for like in likes:
+                        await like.reference.delete()
                     
-                    item_ref.delete()
+                    await item_ref.delete()
+                    invalidate_item_owner(item_id)
                     deleted_count += 1
             except Exception as e:
                 logger.error(f"Error deleting item {item_id}: {e}")
                 continue
         
+        if deleted_count:
+            invalidate_item_list_cache()
         logger.info(f"Bulk deleted {deleted_count} items")
         
         return ApiResponse(
@@ -774,13 +773,13 @@ async def get_admin_notifications(
         docs = query.offset(offset).limit(limit).stream()
         
         notifications = []
-        for doc in docs:
+        async for doc in docs:
             notification_data = doc.to_dict()
             notification_data["id"] = doc.id
             notifications.append(notification_data)
         
-        total_docs = list(notifications_ref.stream())
-        total = len(total_docs)
+        total_result = await notifications_ref.count().get()
+        total = total_result[0][0].value
         
         return ApiResponse(
             success=True,
@@ -806,7 +805,7 @@ async def get_notification_details(notification_id: str):
     """Get detailed notification information"""
     try:
         notification_ref = db.collection("admin-notifications").document(notification_id)
-        notification_doc = notification_ref.get()
+        notification_doc = await notification_ref.get()
         
         if not notification_doc.exists:
             raise HTTPException(
@@ -839,7 +838,7 @@ async def create_admin_notification(
 ):
     """Create admin notification"""
     try:
-        create_notification(
+        await create_notification(
             request.title,
             request.message,
             request.type,
@@ -864,16 +863,16 @@ async def delete_notification(notification_id: str):
     """Delete notification"""
     try:
         notification_ref = db.collection("admin-notifications").document(notification_id)
-        notification_doc = notification_ref.get()
         
-        if not notification_doc.exists:
+        # Precondition on existence instead of reading the document first
+        try:
+            await notification_ref.delete(option=db.write_option(exists=True))
+        except NotFound:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Notification not found"
             )
         
-        notification_ref.delete()
-        
         return ApiResponse(
             success=True,
             message="Notification deleted successfully"
@@ -896,7 +895,7 @@ async def get_user_items(
     """Get all items by specific user"""
     try:
         user_ref = db.collection("users").document(user_id)
-        user_doc = user_ref.get()
+        user_doc = await user_ref.get()
         
         if not user_doc.exists:
             raise HTTPException(
@@ -910,7 +909,7 @@ async def get_user_items(
         items_docs = items_query.stream()
         
         items = []
-        for doc in items_docs:
+        async for doc in items_docs:
             item_data = doc.to_dict()
             item_data["id"] = doc.id
             items.append(item_data)
@@ -919,7 +918,7 @@ async def get_user_items(
         reservations_docs = reservations_query.stream()
         
         reservations = []
-        for doc in reservations_docs:
+        async for doc in reservations_docs:
             reservation_data = doc.to_dict()
             reservation_data["id"] = doc.id
             reservations.append(reservation_data)
@@ -945,12 +944,58 @@ async def get_user_items(
             detail="Failed to retrieve user items"
         )
 
+@admin_router.post("/migrations/keyed-likes")
+async def migrate_keyed_likes():
+    """One-time migration of auto-id likes and favorites to {user_id}_{item_id} document IDs"""
+    try:
+        likes_result, favorites_result = await asyncio.gather(
+            migrate_to_keyed_docs(db, "likes", counter_field="likes"),
+            migrate_to_keyed_docs(db, "favorites")
+        )
+        
+        return ApiResponse(
+            success=True,
+            message="Likes and favorites migrated successfully",
+            data={
+                "likes": likes_result,
+                "favorites": favorites_result
+            }
+        )
+        
+    except Exception as e:
+        logger.error(f"Error migrating likes and favorites: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to migrate likes and favorites"
+        )
+
+@admin_router.post("/migrations/item-sort-fields")
+async def migrate_item_sort_fields():
+    """One-time backfill of name_lower and expiry_date on items created before the feed sorted in Firestore"""
+    try:
+        updated_count = await backfill_item_sort_fields(db)
+        if updated_count:
+            invalidate_item_list_cache()
+        
+        return ApiResponse(
+            success=True,
+            message="Item sort fields backfilled successfully",
+            data={"updated_count": updated_count}
+        )
+        
+    except Exception as e:
+        logger.error(f"Error backfilling item sort fields: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to backfill item sort fields"
+        )
+
 @admin_router.get("/demand-areas")
 async def get_demand_areas():
     """Get areas with high demand for Google Maps integration"""
     try:
         reservations_ref = db.collection("reservations")
-        reservations = list(reservations_ref.stream())
+        reservations = [doc async for doc in reservations_ref.stream()]
         
         location_demand = defaultdict(int)
         location_coords = {}
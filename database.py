@@ -0,0 +1,55 @@
+import asyncio
+import base64
+import itertools
+import json
+import logging
+import os
+from google.cloud import firestore, storage
+from google.oauth2 import service_account
+
+logger = logging.getLogger(__name__)
+
+# Each AsyncClient owns one gRPC channel, whose concurrent streams cap throughput under load
+FIRESTORE_CLIENT_POOL_SIZE = int(os.getenv("FIRESTORE_CLIENT_POOL_SIZE", "4"))
+
+class FirestoreClientPool:
+    """Round-robins client calls (collection, document, batch, ...) over several AsyncClients"""
+
+    def __init__(self, clients):
+        self.clients = clients
+        self._next_client = itertools.cycle(clients)
+
+    def __getattr__(self, name):
+        return getattr(next(self._next_client), name)
+
+# One client pool shared by every router in the process
+try:
+    # Load credentials from base64 env var
+    creds_json = base64.b64decode(os.environ["GOOGLE_APPLICATION_CREDENTIALS"])
+    creds_dict = json.loads(creds_json)
+    credentials = service_account.Credentials.from_service_account_info(creds_dict)
+
+    # Firestore & Storage with credentials
+    db = FirestoreClientPool([
+        firestore.AsyncClient(credentials=credentials, project=creds_dict["project_id"])
+        for _ in range(max(FIRESTORE_CLIENT_POOL_SIZE, 1))
+    ])
+    storage_client = storage.Client(credentials=credentials, project=creds_dict["project_id"])
+    bucket = storage_client.bucket("sharecare-466314.appspot.com")
+
+    logger.info("Firestore and Storage clients initialized successfully")
+
+except Exception as e:
+    logger.error(f"Failed to initialize clients: {e}")
+    db = None
+    bucket = None
+
+async def warm_up_db():
+    """Issue a tiny read on every pooled client so their gRPC channels are open before the first real request"""
+    if not db:
+        return
+    try:
+        await asyncio.gather(*[client.collection("items").limit(1).get() for client in db.clients])
+        logger.info("Firestore connection warmed up")
+    except Exception as e:
+        logger.error(f"Firestore warm-up failed: {e}")
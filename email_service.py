@@ -1,3 +1,4 @@
+import asyncio
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -195,6 +196,11 @@ class EmailService:
             logger.warning("Email not sent - credentials not configured")
             return
         
+        # Image downloads and SMTP are blocking, so they run in a worker thread instead of on the event loop
+        await asyncio.to_thread(self._send_email_sync, to_email, subject, html_content, text_content, attachments)
+    
+    def _send_email_sync(self, to_email: str, subject: str, html_content: str, text_content: str = None, attachments: List[str] = None):
+        """Build and send an email (blocking)"""
         try:
             msg = MIMEMultipart("mixed")
             msg["Subject"] = subject
@@ -1,14 +1,14 @@
-import base64
-import json
-import os
-from fastapi import  FastAPI, HTTPException, status, Depends, Header, Query, File, UploadFile, Form
+import asyncio
+from fastapi import  FastAPI, HTTPException, status, Depends, Header, Query, File, UploadFile, Form, Response, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from typing import Optional, Dict, Any, List
 import logging
 from datetime import datetime, timedelta
-from google.cloud import firestore, storage
+from google.cloud import firestore
+from google.api_core.exceptions import NotFound
 from google.auth.transport import requests as google_requests
-from google.oauth2 import id_token as idtoken, service_account
+from google.oauth2 import id_token as idtoken
 import uuid
 from email_service import email_service
 from admin_routes import admin_router
@@ -23,7 +23,8 @@ app = FastAPI(
     description="Backend API for ShareCare mobile application - Food & Clothes Connect",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 app.include_router(admin_router)
@@ -39,23 +40,12 @@ app.add_middleware(
 from models import *
 from util_functions import *
 
-try:
-    # Load credentials from base64 env var
-    creds_json = base64.b64decode(os.environ["GOOGLE_APPLICATION_CREDENTIALS"])
-    creds_dict = json.loads(creds_json)
-    credentials = service_account.Credentials.from_service_account_info(creds_dict)
+from database import db, bucket, warm_up_db
 
-    # Firestore & Storage with credentials
-    db = firestore.Client(credentials=credentials, project=creds_dict["project_id"])
-    storage_client = storage.Client(credentials=credentials, project=creds_dict["project_id"])
-    bucket = storage_client.bucket("sharecare-466314.appspot.com")
-
-    logger.info("Firestore and Storage clients initialized successfully")
-
-except Exception as e:
-    logger.error(f"Failed to initialize clients: {e}")
-    db = None
-    bucket = None
+@app.on_event("startup")
+async def startup():
+    """Open the Firestore channel before serving traffic"""
+    await warm_up_db()
 
 
 # Admin email
@@ -193,7 +183,7 @@ async def create_user(
             )
         
         user_ref = db.collection("users").document(request.uid)
-        user_doc = user_ref.get()
+        user_doc = await user_ref.get()
         
         if user_doc.exists:
             return ApiResponse(
@@ -219,9 +209,10 @@ async def create_user(
             "isAdmin": False
         }
         
-        user_ref.set(user_data)
+        await user_ref.set(user_data)
+        invalidate_user_profile(request.uid)
         
-        create_notification(
+        await create_notification(
             db=db,
                 title="New User Registered",
                 message=f"New user account registered: {request.full_name} ({request.email})",
@@ -262,7 +253,7 @@ async def get_user_profile(current_user: Dict[str, Any] = Depends(get_current_us
     
     try:
         user_ref = db.collection("users").document(current_user["uid"])
-        user_doc = user_ref.get()
+        user_doc = await user_ref.get()
         
         if user_doc.exists:
             user_data = user_doc.to_dict()
@@ -300,7 +291,7 @@ async def update_user_profile(
     print("Updating user profile",current_user, request)
     try:
         user_ref = db.collection("users").document(current_user["uid"])
-        user_doc = user_ref.get()
+        user_doc = await user_ref.get()
         
         if not user_doc.exists:
             raise HTTPException(
@@ -322,9 +313,10 @@ async def update_user_profile(
             update_data["bio"] = request.bio
         if request.photo_url is not None:
             update_data["photo_url"] = request.photo_url
-        user_ref.update(update_data)
+        await user_ref.update(update_data)
+        invalidate_user_profile(current_user["uid"])
         
-        updated_doc = user_ref.get()
+        updated_doc = await user_ref.get()
         
         return ApiResponse(
             success=True,
@@ -355,18 +347,14 @@ async def upload_file(
             )
         
         # Validate file type
-        allowed_types = ['image/jpeg', 'image/png', 'image/gif', 'image/webp']
-        if file.content_type not in allowed_types:
+        if not await is_valid_image(file):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid file type. Only images are allowed."
             )
         
-        # Read file content
-        file_content = await file.read()
-        
         # Upload to storage
-        file_url = upload_file_to_storage( bucket, file_content, file.filename, file.content_type)
+        file_url = await upload_file_to_storage_async(bucket, file.file, file.filename, file.content_type)
         
         return ApiResponse(
             success=True,
@@ -388,6 +376,7 @@ async def upload_file(
 async def get_items(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
     category: Optional[str] = Query(None),
     status: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
@@ -397,66 +386,67 @@ async def get_items(
 ):
     """Get items with pagination and filters"""
     try:
-        items_ref = db.collection("items")
-        query = items_ref
+        query = db.collection("items")
         
         if category:
-            query = query.where("category", "==", category)
+            query = query.where(filter=FieldFilter("category", "==", category))
         if status:
-            query = query.where("status", "==", status)
-        
-        docs = query.stream()
-        items = []
-        
-        for doc in docs:
-            item_data = doc.to_dict()
-            item_data["id"] = doc.id
-            
-            if search:
-                search_lower = search.lower()
-                if (search_lower not in item_data.get("name", "").lower() and
-                    search_lower not in item_data.get("description", "").lower()):
-                    continue
-            
-            items.append(item_data)
-        
-        reverse = sortOrder == "desc"
-        if sortBy == "name":
-            items.sort(key=lambda x: x.get("name", "").lower(), reverse=reverse)
-        elif sortBy == "expiry_date":
-            items.sort(key=lambda x: x.get("expiry_date", ""), reverse=reverse)
+            query = query.where(filter=FieldFilter("status", "==", status))
+        
+        # array_contains_any accepts at most 10 values
+        search_tokens = tokenize(search)[:10]
+        if search_tokens:
+            query = query.where(filter=FieldFilter("search_tokens", "array_contains_any", search_tokens))
+        
+        # Filter, order and page in Firestore; each (filter, sort field) pair has an index in firestore.indexes.json
+        sort_field = ITEM_SORT_FIELDS.get(sortBy, "created_at")
+        direction = firestore.Query.DESCENDING if sortOrder == "desc" else firestore.Query.ASCENDING
+        page_query = order_by_field_and_id(query, sort_field, direction)
+        if cursor:
+            page_query = start_after_sort_cursor(page_query, cursor, sort_field)
+        
+        if search_tokens:
+            # Older clients paging by number skip matching items, since skipped rows may not match
+            skip = (page - 1) * limit if not cursor else 0
+            page_task = fetch_search_page(page_query, search_tokens, limit, skip, sort_field)
+            # A count can only use the any-word query, which overcounts, so searches report no total
+            total_task = asyncio.sleep(0)
         else:
-            items.sort(key=lambda x: x.get("created_at", ""), reverse=reverse)
-        
-        start_idx = (page - 1) * limit
-        end_idx = start_idx + limit
-        paginated_items = items[start_idx:end_idx]
-    
-        donor_requests_item= await get_donor_reservations_data(current_user["uid"])
-        pending_requests_item=[]
-        for item in donor_requests_item:
-            if item["status"] == "pending":
-                pending_requests_item.append(item)
-
-
-        un_read_notifications_count = await get_unread_notifications_count(current_user)
-        all_unread_messages_count = await get_unread_messages_count(current_user["uid"])
+            page_query = page_query.limit(limit)
+            if not cursor and page > 1:
+                # Older clients still page by number; offset skips server-side without sending the rows
+                page_query = page_query.offset((page - 1) * limit)
+            page_task = fetch_item_page(page_query, limit, sort_field)
+            total_task = count_documents(query)
+        
+        # Badge counts come from aggregation queries, so no documents are streamed just to be counted
+        pending_requests_query = db.collection("reservations").where("donor_id", "==", current_user["uid"]).where("status", "==", "pending")
+        (paginated_items, next_cursor), total, donor_requests_count, un_read_notifications_count, all_unread_messages_count = await asyncio.gather(
+            page_task,
+            total_task,
+            count_documents(pending_requests_query),
+            get_unread_notifications_count(current_user),
+            get_unread_messages_count(current_user["uid"])
+        )
 
         return ApiResponse(
             success=True,
-            message="Items retrieved successfully",
+            message="Items retrieved successfully" if total is not None else "Items retrieved successfully; totals are not counted for searches",
             data={
                 "all_unread_messages_count": all_unread_messages_count,
                 "un_read_notifications_count": un_read_notifications_count,
-                "donor_requests_count": len(pending_requests_item),
+                "donor_requests_count": donor_requests_count,
                 "items": paginated_items,
-                "total": len(items),
+                "total": total,
                 "page": page,
                 "limit": limit,
-                "total_pages": (len(items) + limit - 1) // limit
+                "total_pages": (total + limit - 1) // limit if total is not None else None,
+                "next_cursor": next_cursor
             }
         )
         
+    except HTTPException as e:
+        raise e
     except Exception as e:
         logger.error(f"Error retrieving items: {e}")
         raise HTTPException(
@@ -471,16 +461,14 @@ async def create_item(
 ):
     """Create new item"""
     try:
-        user_ref = db.collection("users").document(current_user["uid"])
-        user_doc = user_ref.get()
+        current_user_data= await get_current_user_Data_from_database( db=db, uid=current_user["uid"], fields=DONOR_PROFILE_FIELDS)
         
-        if not user_doc.exists:
+        if not current_user_data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User profile not found"
             )
-        current_user_data= await get_current_user_Data_from_database( db=db, uid=current_user["uid"])
-        user_data = user_doc.to_dict()
+        user_data = current_user_data
         
         item_data = {
             "name": request.name,
@@ -506,6 +494,8 @@ async def create_item(
             "is_for_sale": request.is_for_sale,
             "price": request.price,
             "images": [],
+            "name_lower": request.name.lower(),
+            "search_tokens": build_search_tokens(request.name, request.description),
             "status": "available",
             "is_verified": False,
             "likes": 0,
@@ -514,7 +504,8 @@ async def create_item(
             "updated_at": datetime.utcnow().isoformat()
         }
         
-        doc_ref = db.collection("items").add(item_data)
+        doc_ref = await db.collection("items").add(item_data)
+        invalidate_item_list_cache()
         item_data["id"] = doc_ref[1].id
         
 
@@ -551,7 +542,7 @@ async def get_item(
     """Get item by ID"""
     try:
         item_ref = db.collection("items").document(item_id)
-        item_doc = item_ref.get()
+        item_doc = await item_ref.get()
         
         if not item_doc.exists:
             raise HTTPException(
@@ -563,7 +554,7 @@ async def get_item(
         item_data["id"] = item_doc.id
         
         # Increment view count
-        item_ref.update({"views": item_data.get("views", 0) + 1})
+        await item_ref.update({"views": item_data.get("views", 0) + 1})
         
         return ApiResponse(
             success=True,
@@ -589,7 +580,7 @@ async def update_item(
     """Update item"""
     try:
         item_ref = db.collection("items").document(item_id)
-        item_doc = item_ref.get()
+        item_doc = await item_ref.get()
         
         if not item_doc.exists:
             raise HTTPException(
@@ -610,6 +601,7 @@ async def update_item(
         
         if request.name:
             update_data["name"] = request.name
+            update_data["name_lower"] = request.name.lower()
         if request.description:
             update_data["description"] = request.description
         if request.category:
@@ -620,12 +612,17 @@ async def update_item(
             update_data["expiry_date"] = request.expiry_date
         if request.status:
             update_data["status"] = request.status
+        if request.name or request.description:
+            update_data["search_tokens"] = build_search_tokens(
+                update_data.get("name", item_data.get("name")),
+                update_data.get("description", item_data.get("description"))
+            )
         
-        item_ref.update(update_data)
+        await item_ref.update(update_data)
+        invalidate_item_list_cache()
         
-        updated_doc = item_ref.get()
-        updated_data = updated_doc.to_dict()
-        updated_data["id"] = item_id
+        # No server-side transforms are used, so the merged dict matches the stored document
+        updated_data = {**item_data, **update_data, "id": item_id}
         
         return ApiResponse(
             success=True,
@@ -650,7 +647,7 @@ async def delete_item(
     """Delete item"""
     try:
         item_ref = db.collection("items").document(item_id)
-        item_doc = item_ref.get()
+        item_doc = await item_ref.get()
         
         if not item_doc.exists:
             raise HTTPException(
@@ -670,16 +667,18 @@ async def delete_item(
         # Delete related reservations
         reservations_query = db.collection("reservations").where("item_id", "==", item_id)
         reservations = reservations_query.stream()
-        for reservation in reservations:
-            reservation.reference.delete()
+        async for reservation in reservations:
+            await reservation.reference.delete()
         
         # Delete related likes
         likes_query = db.collection("likes").where("item_id", "==", item_id)
         likes = likes_query.stream()
-        for like in likes:
-            like.reference.delete()
+        async for like in likes:
+            await like.reference.delete()
         
-        item_ref.delete()
+        await item_ref.delete()
+        invalidate_item_list_cache()
+        invalidate_item_owner(item_id)
         
         return ApiResponse(
             success=True,
@@ -710,38 +709,41 @@ async def upload_item_images(
             )
         
         item_ref = db.collection("items").document(item_id)
-        item_doc = item_ref.get()
+        donor_id = await get_item_donor_id(db, item_id)
         
-        if not item_doc.exists:
+        if donor_id is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Item not found"
             )
         
-        item_data = item_doc.to_dict()
-        
-        if item_data.get("donor_id") != current_user["uid"]:
+        if donor_id != current_user["uid"]:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not authorized to upload images for this item"
             )
         
-        uploaded_urls = []
+        valid_files = [file for file in files if await is_valid_image(file)]
         
-        for file in files:
-            if file.content_type not in ['image/jpeg', 'image/png', 'image/gif', 'image/webp']:
-                continue
-            
-            file_content = await file.read()
-            file_url = upload_file_to_storage( bucket, file_content, file.filename, file.content_type)
-            uploaded_urls.append(file_url)
+        # Upload all images concurrently
+        results = await asyncio.gather(
+            *[
+                upload_file_to_storage_async(bucket, file.file, file.filename, file.content_type)
+                for file in valid_files
+            ],
+            return_exceptions=True
+        )
         
-        # Update item with image URLs
-        current_images = item_data.get("images", [])
-        updated_images = current_images + uploaded_urls
+        uploaded_urls = []
+        for file, result in zip(valid_files, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to upload image {file.filename}: {result}")
+                continue
+            uploaded_urls.append(result)
         
-        item_ref.update({
-            "images": updated_images,
+        # Append image URLs on the server so concurrent uploads don't overwrite each other
+        await item_ref.update({
+            "images": firestore.ArrayUnion(uploaded_urls),
             "updated_at": datetime.utcnow().isoformat()
         })
         
@@ -768,7 +770,7 @@ async def like_item(
     """Like an item"""
     try:
         item_ref = db.collection("items").document(item_id)
-        item_doc = item_ref.get()
+        item_doc = await item_ref.get()
         
         if not item_doc.exists:
             raise HTTPException(
@@ -776,29 +778,23 @@ async def like_item(
                 detail="Item not found"
             )
         
-        # Check if user already liked this item
-        likes_ref = db.collection("likes").where("item_id", "==", item_id).where("user_id", "==", current_user["uid"])
-        existing_likes = list(likes_ref.stream())
-        
-        if existing_likes:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Item already liked"
-            )
-        
-        # Add like
+        # Add like, keyed by user and item so a duplicate like fails on create
         like_data = {
             "item_id": item_id,
             "user_id": current_user["uid"],
             "created_at": datetime.utcnow().isoformat()
         }
         
-        db.collection("likes").add(like_data)
+        like_ref = db.collection("likes").document(f"{current_user['uid']}_{item_id}")
+        if not await create_keyed_or_legacy(db, like_ref, "likes", item_id, current_user["uid"], like_data):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Item already liked"
+            )
         
-        # Update item likes count
-        item_data = item_doc.to_dict()
-        new_likes_count = item_data.get("likes", 0) + 1
-        item_ref.update({"likes": new_likes_count})
+        # Update item likes count atomically on the server
+        await item_ref.update({"likes": firestore.Increment(1)})
+        new_likes_count = item_doc.to_dict().get("likes", 0) + 1
         
         return ApiResponse(
             success=True,
@@ -823,7 +819,7 @@ async def unlike_item(
     """Unlike an item"""
     try:
         item_ref = db.collection("items").document(item_id)
-        item_doc = item_ref.get()
+        item_doc = await item_ref.get()
         
         if not item_doc.exists:
             raise HTTPException(
@@ -831,24 +827,18 @@ async def unlike_item(
                 detail="Item not found"
             )
         
-        # Find and remove like
-        likes_ref = db.collection("likes").where("item_id", "==", item_id).where("user_id", "==", current_user["uid"])
-        existing_likes = list(likes_ref.stream())
-        
-        if not existing_likes:
+        # Remove like
+        like_ref = db.collection("likes").document(f"{current_user['uid']}_{item_id}")
+        deleted_likes = await delete_keyed_or_legacy(db, like_ref, "likes", item_id, current_user["uid"])
+        if not deleted_likes:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Item not liked"
             )
         
-        # Remove like
-        for like_doc in existing_likes:
-            like_doc.reference.delete()
-        
-        # Update item likes count
-        item_data = item_doc.to_dict()
-        new_likes_count = max(0, item_data.get("likes", 0) - 1)
-        item_ref.update({"likes": new_likes_count})
+        # Update item likes count atomically on the server, once per removed duplicate too
+        await item_ref.update({"likes": firestore.Increment(-deleted_likes)})
+        new_likes_count = max(0, item_doc.to_dict().get("likes", 0) - deleted_likes)
         
         return ApiResponse(
             success=True,
@@ -868,6 +858,7 @@ async def unlike_item(
 @app.post("/api/v1/items/{item_id}/reserve")
 async def reserve_item(
     item_id: str,
+    background_tasks: BackgroundTasks,
     quantity: int = Form(1),
     message: Optional[str] = Form(None),
     current_user: Dict[str, Any] = Depends(get_current_user)
@@ -875,7 +866,8 @@ async def reserve_item(
     """Reserve an item"""
     try:
         item_ref = db.collection("items").document(item_id)
-        item_doc = item_ref.get()
+        user_ref = db.collection("users").document(current_user["uid"])
+        item_doc, user_doc = await get_documents(db, [item_ref, user_ref])
         
         if not item_doc.exists:
             raise HTTPException(
@@ -897,8 +889,6 @@ async def reserve_item(
                 detail="Cannot reserve your own item"
             )
         
-        user_ref = db.collection("users").document(current_user["uid"])
-        user_doc = user_ref.get()
         user_data = user_doc.to_dict() if user_doc.exists else {}
         
         reservation_data = {
@@ -912,13 +902,15 @@ async def reserve_item(
             "status": "pending",
             "location": item_data.get("location", {}),
             "created_at": datetime.utcnow().isoformat(),
-            "updated_at": datetime.utcnow().isoformat()
+            "updated_at": datetime.utcnow().isoformat(),
+            "item": build_item_snapshot(item_data)
         }
         
-        doc_ref = db.collection("reservations").add(reservation_data)
+        doc_ref = await db.collection("reservations").add(reservation_data)
         reservation_data["id"] = doc_ref[1].id
         
-        create_notification(
+        background_tasks.add_task(
+            create_notification,
             db=db,
             title="New Reservation Request",
             message=f"Someone wants to reserve your item '{item_data.get('name', 'Unknown')}'",
@@ -945,6 +937,7 @@ async def reserve_item(
 @app.post("/api/v1/items/{item_id}/pickup")
 async def mark_item_picked_up(
     item_id: str,
+    background_tasks: BackgroundTasks,
     reservationId: str = Form(...),
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
@@ -952,7 +945,7 @@ async def mark_item_picked_up(
     try:
         # Verify reservation exists and belongs to user
         reservation_ref = db.collection("reservations").document(reservationId)
-        reservation_doc = reservation_ref.get()
+        reservation_doc = await reservation_ref.get()
         
         if not reservation_doc.exists:
             raise HTTPException(
@@ -968,8 +961,14 @@ async def mark_item_picked_up(
                 detail="Not authorized to mark this item as picked up"
             )
         
+        tracking_query = db.collection("tracking").where("reservation_id", "==", reservationId).limit(1)
+        tracking_docs = await tracking_query.get()
+        
+        # Reservation, item and tracking updates go out in a single commit
+        batch = db.batch()
+        
         # Update reservation status
-        reservation_ref.update({
+        batch.update(reservation_ref, {
             "status": "picked_up",
             "picked_up_at": datetime.utcnow().isoformat(),
             "updated_at": datetime.utcnow().isoformat()
@@ -977,24 +976,30 @@ async def mark_item_picked_up(
         
         # Update item status
         item_ref = db.collection("items").document(item_id)
-        item_ref.update({
+        batch.update(item_ref, {
             "status": "donated",
             "updated_at": datetime.utcnow().isoformat()
         })
         
         # Update tracking status if exists
-        tracking_query = db.collection("tracking").where("reservation_id", "==", reservationId)
-        tracking_docs = list(tracking_query.stream())
-        
         if tracking_docs:
             tracking_doc = tracking_docs[0]
             tracking_data = tracking_doc.to_dict()
-            update_tracking_status(
-                db,
-                tracking_data["tracking_id"], 
-                "picked_up", 
+            batch.update(tracking_doc.reference, build_tracking_status_update(
+                "picked_up",
                 "Item successfully picked up by requester",
                 current_user["uid"]
+            ))
+        
+        await batch.commit()
+        
+        if tracking_docs:
+            background_tasks.add_task(
+                notify_tracking_status,
+                db,
+                tracking_data["tracking_id"],
+                "picked_up",
+                tracking_data["requester_id"]
             )
         
         return ApiResponse(
@@ -1020,7 +1025,7 @@ async def report_item(
     """Report an item"""
     try:
         item_ref = db.collection("items").document(item_id)
-        item_doc = item_ref.get()
+        item_doc = await item_ref.get()
         
         if not item_doc.exists:
             raise HTTPException(
@@ -1037,7 +1042,7 @@ async def report_item(
             "created_at": datetime.utcnow().isoformat()
         }
         
-        db.collection("reports").add(report_data)
+        await db.collection("reports").add(report_data)
         
         
         return ApiResponse(
@@ -1061,23 +1066,19 @@ async def add_to_favorites(
 ):
     """Add item to favorites"""
     try:
-        # Check if already in favorites
-        favorites_query = db.collection("favorites").where("item_id", "==", item_id).where("user_id", "==", current_user["uid"])
-        existing_favorites = list(favorites_query.stream())
-        
-        if existing_favorites:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Item already in favorites"
-            )
-        
         favorite_data = {
             "item_id": item_id,
             "user_id": current_user["uid"],
             "created_at": datetime.utcnow().isoformat()
         }
         
-        db.collection("favorites").add(favorite_data)
+        # Keyed by user and item so a duplicate favorite fails on create
+        favorite_ref = db.collection("favorites").document(f"{current_user['uid']}_{item_id}")
+        if not await create_keyed_or_legacy(db, favorite_ref, "favorites", item_id, current_user["uid"], favorite_data):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Item already in favorites"
+            )
         
         return ApiResponse(
             success=True,
@@ -1100,18 +1101,13 @@ async def remove_from_favorites(
 ):
     """Remove item from favorites"""
     try:
-        favorites_query = db.collection("favorites").where("item_id", "==", item_id).where("user_id", "==", current_user["uid"])
-        existing_favorites = list(favorites_query.stream())
-        
-        if not existing_favorites:
+        favorite_ref = db.collection("favorites").document(f"{current_user['uid']}_{item_id}")
+        if not await delete_keyed_or_legacy(db, favorite_ref, "favorites", item_id, current_user["uid"]):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Item not in favorites"
             )
         
-        for favorite_doc in existing_favorites:
-            favorite_doc.reference.delete()
-        
         return ApiResponse(
             success=True,
             message="Item removed from favorites"
@@ -1129,25 +1125,40 @@ async def remove_from_favorites(
 @app.get("/api/v1/items/category/{category}")
 async def get_items_by_category(
     category: str,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    if_none_match: Optional[str] = Header(None),
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """Get items by category"""
     try:
-        items_query = db.collection("items").where("category", "==", category).where("status", "==", "available")
-        items_docs = items_query.stream()
+        cache_key = ("category", category, limit, cursor)
+        cached = item_list_cache.get(cache_key)
         
-        items = []
-        for doc in items_docs:
-            item_data = doc.to_dict()
-            item_data["id"] = doc.id
-            items.append(item_data)
+        if cached is None:
+            items_query = available_items_query(db, category).order_by("created_at", direction=firestore.Query.DESCENDING)
+            items_docs = paginate_query(items_query.select(ITEM_LIST_FIELDS), limit, cursor).stream()
+            
+            items = []
+            async for doc in items_docs:
+                item_data = doc.to_dict()
+                item_data["id"] = doc.id
+                items.append(item_data)
+            
+            page = {"items": items, "next_cursor": next_page_cursor(items, limit)}
+            cached = (page, compute_etag(page))
+            item_list_cache[cache_key] = cached
         
-        items.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+        page, etag = cached
+        if if_none_match == etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        response.headers["ETag"] = etag
         
         return ApiResponse(
             success=True,
             message="Items retrieved successfully",
-            data={"items": items}
+            data=page
         )
         
     except Exception as e:
@@ -1159,40 +1170,58 @@ async def get_items_by_category(
 
 @app.get("/api/v1/items/search")
 async def search_items(
+    response: Response,
     q: str = Query(...),
     category: Optional[str] = Query(None),
     location: Optional[str] = Query(None),
     radius: Optional[int] = Query(10),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    if_none_match: Optional[str] = Header(None),
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """Search items"""
     try:
-        items_ref = db.collection("items")
-        query = items_ref.where("status", "==", "available")
+        # array_contains_any accepts at most 10 values
+        search_tokens = tokenize(q)[:10]
         
-        if category:
-            query = query.where("category", "==", category)
-        
-        docs = query.stream()
-        items = []
+        cache_key = ("search", tuple(search_tokens), category, limit, cursor)
+        cached = item_list_cache.get(cache_key)
         
-        search_lower = q.lower()
-        
-        for doc in docs:
-            item_data = doc.to_dict()
-            item_data["id"] = doc.id
+        if cached is None:
+            items = []
+            scanned = []
             
-            # Search in name and description
-            if (search_lower in item_data.get("name", "").lower() or
-                search_lower in item_data.get("description", "").lower()):
-                items.append(item_data)
+            if search_tokens:
+                query = available_items_query(db, category).where(filter=FieldFilter("search_tokens", "array_contains_any", search_tokens))
+                
+                query = query.order_by("created_at", direction=firestore.Query.DESCENDING).select(ITEM_LIST_FIELDS + ["search_tokens"])
+                docs = paginate_query(query, limit, cursor).stream()
+                
+                async for doc in docs:
+                    item_data = doc.to_dict()
+                    item_data["id"] = doc.id
+                    scanned.append(item_data)
+                    
+                    # Require every search word, not just any of them
+                    item_tokens = set(item_data.pop("search_tokens", []))
+                    if all(token in item_tokens for token in search_tokens):
+                        items.append(item_data)
+            
+            # The cursor follows the scanned documents, so pages can hold fewer than limit matches
+            page = {"items": items, "next_cursor": next_page_cursor(scanned, limit)}
+            cached = (page, compute_etag(page))
+            item_list_cache[cache_key] = cached
         
-        items.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+        page, etag = cached
+        if if_none_match == etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        response.headers["ETag"] = etag
         
         return ApiResponse(
             success=True,
             message="Search completed successfully",
-            data={"items": items}
+            data=page
         )
         
     except Exception as e:
@@ -1205,25 +1234,25 @@ async def search_items(
 # User-specific item routes
 @app.get("/api/v1/user/donations")
 async def get_user_donations(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """Get items donated by current user"""
     try:
-        items_query = db.collection("items").where("donor_id", "==", current_user["uid"])
-        items_docs = items_query.stream()
+        items_query = donor_items_query(db, current_user["uid"]).order_by("created_at", direction=firestore.Query.DESCENDING)
+        items_docs = paginate_query(items_query, limit, cursor).stream()
         
         items = []
-        for doc in items_docs:
+        async for doc in items_docs:
             item_data = doc.to_dict()
             item_data["id"] = doc.id
             items.append(item_data)
         
-        items.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-        
         return ApiResponse(
             success=True,
             message="User donations retrieved successfully",
-            data={"items": items}
+            data={"items": items, "next_cursor": next_page_cursor(items, limit)}
         )
         
     except Exception as e:
@@ -1235,32 +1264,34 @@ async def get_user_donations(
 
 @app.get("/api/v1/user/reservations")
 async def get_user_reservations(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """Get reservations made by current user"""
     try:
-        reservations_query = db.collection("reservations").where("user_id", "==", current_user["uid"])
-        reservations_docs = reservations_query.stream()
+        reservations_query = user_reservations_query(db, current_user["uid"]).order_by("created_at", direction=firestore.Query.DESCENDING)
+        reservations_docs = paginate_query(reservations_query, limit, cursor).stream()
         
         reservations = []
-        for doc in reservations_docs:
+        async for doc in reservations_docs:
             reservation_data = doc.to_dict()
             reservation_data["id"] = doc.id
-            
-            # Get item details
-            item_ref = db.collection("items").document(reservation_data["item_id"])
-            item_doc = item_ref.get()
-            if item_doc.exists:
-                reservation_data["item"] = item_doc.to_dict()
-            
             reservations.append(reservation_data)
         
-        reservations.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+        # Get item details in one batched read
+        item_docs = await get_documents_by_path(
+            db, [db.collection("items").document(r["item_id"]) for r in reservations]
+        )
+        for reservation_data in reservations:
+            item_doc = item_docs[f"items/{reservation_data['item_id']}"]
+            if item_doc.exists:
+                reservation_data["item"] = item_doc.to_dict()
         
         return ApiResponse(
             success=True,
             message="User reservations retrieved successfully",
-            data={"reservations": reservations}
+            data={"reservations": reservations, "next_cursor": next_page_cursor(reservations, limit)}
         )
         
     except Exception as e:
@@ -1276,23 +1307,24 @@ async def get_user_pickups(
 ):
     """Get items picked up by current user"""
     try:
-        reservations_query = db.collection("reservations").where("user_id", "==", current_user["uid"]).where("status", "==", "picked_up")
+        reservations_query = user_reservations_query(db, current_user["uid"], "picked_up")
         reservations_docs = reservations_query.stream()
         
         
         pickups = []
-        for doc in reservations_docs:
-            print(doc.to_dict())
+        async for doc in reservations_docs:
             pickup_data = doc.to_dict()
             pickup_data["id"] = doc.id
-            
-            # Get item details
-            item_ref = db.collection("items").document(pickup_data["item_id"])
-            item_doc = item_ref.get()
+            pickups.append(pickup_data)
+        
+        # Get item details in one batched read
+        item_docs = await get_documents_by_path(
+            db, [db.collection("items").document(p["item_id"]) for p in pickups]
+        )
+        for pickup_data in pickups:
+            item_doc = item_docs[f"items/{pickup_data['item_id']}"]
             if item_doc.exists:
                 pickup_data["item"] = item_doc.to_dict()
-            
-            pickups.append(pickup_data)
         
         pickups.sort(key=lambda x: x.get("picked_up_at", x.get("created_at", "")), reverse=True)
         
@@ -1311,32 +1343,34 @@ async def get_user_pickups(
 
 @app.get("/api/v1/user/favorites")
 async def get_favorite_items(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """Get user's favorite items"""
     try:
-        favorites_query = db.collection("favorites").where("user_id", "==", current_user["uid"])
-        favorites_docs = favorites_query.stream()
+        favorites_query = db.collection("favorites").where("user_id", "==", current_user["uid"]).order_by("created_at", direction=firestore.Query.DESCENDING)
+        favorites_docs = paginate_query(favorites_query, limit, cursor).stream()
+        
+        favorites = [doc.to_dict() async for doc in favorites_docs]
         
+        # Get item details in one batched read
+        item_docs = await get_documents_by_path(
+            db, [db.collection("items").document(f["item_id"]) for f in favorites]
+        )
         favorite_items = []
-        for doc in favorites_docs:
-            favorite_data = doc.to_dict()
-            
-            # Get item details
-            item_ref = db.collection("items").document(favorite_data["item_id"])
-            item_doc = item_ref.get()
+        for favorite_data in favorites:
+            item_doc = item_docs[f"items/{favorite_data['item_id']}"]
             if item_doc.exists:
                 item_data = item_doc.to_dict()
                 item_data["id"] = item_doc.id
                 item_data["favorited_at"] = favorite_data.get("created_at")
                 favorite_items.append(item_data)
         
-        favorite_items.sort(key=lambda x: x.get("favorited_at", ""), reverse=True)
-        
         return ApiResponse(
             success=True,
             message="Favorite items retrieved successfully",
-            data={"items": favorite_items}
+            data={"items": favorite_items, "next_cursor": next_page_cursor(favorites, limit)}
         )
         
     except Exception as e:
@@ -1346,16 +1380,52 @@ async def get_favorite_items(
             detail="Failed to retrieve favorite items"
         )
 
+async def send_reservation_emails(item_data: dict, user_data: dict, message: Optional[str]):
+    """Send reservation emails to donor and requester (run as a background task)"""
+    try:
+        # Email to donor
+        await email_service.send_reservation_request_email(
+            item_data.get("donor_id"), 
+            item_data.get("donor_name", "Donor"), 
+            user_data.get("full_name", "User"), 
+            item_data, 
+            message
+        )
+        
+        # Email to requester
+        await email_service.send_reservation_confirmation_email(
+            user_data["email"], 
+            user_data.get("full_name", "User"), 
+            item_data.get("donor_name", "Donor"), 
+            item_data
+        )
+    except Exception as e:
+        logger.error(f"Failed to send reservation emails: {e}")
+
+async def send_tracking_email(requester_data: dict, item_data: dict, tracking_id: str):
+    """Send the tracking email to the requester (run as a background task)"""
+    try:
+        await email_service.send_tracking_email(
+            requester_data.get("email", ""),
+            requester_data.get("full_name", "User"),
+            item_data,
+            tracking_id
+        )
+    except Exception as e:
+        logger.error(f"Failed to send tracking email: {e}")
+
 # Reservations Routes
 @app.post("/api/v1/reservations")
 async def create_reservation(
     request: ReservationRequest,
+    background_tasks: BackgroundTasks,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """Create item reservation"""
     try:
+        now = datetime.utcnow().isoformat()
         item_ref = db.collection("items").document(request.item_id)
-        item_doc = item_ref.get()
+        item_doc = await item_ref.get()
         
         if not item_doc.exists:
             raise HTTPException(
@@ -1378,7 +1448,7 @@ async def create_reservation(
             )
         
         user_ref = db.collection("users").document(current_user["uid"])
-        user_doc = user_ref.get()
+        user_doc = await user_ref.get()
         user_data = user_doc.to_dict() if user_doc.exists else {}
         
         reservation_data = {
@@ -1391,8 +1461,8 @@ async def create_reservation(
             "requested_quantity": getattr(request, 'requested_quantity', 1),
             "status": "pending",
             "location": item_data.get("location", {}),
-            "created_at": datetime.utcnow().isoformat(),
-            "updated_at": datetime.utcnow().isoformat(),
+            "created_at": now,
+            "updated_at": now,
             "item":{
                 "name": item_data.get("name",""),
                 "category": item_data.get("category",""),
@@ -1401,38 +1471,23 @@ async def create_reservation(
             }
         }
         
-        doc_ref = db.collection("reservations").add(reservation_data)
-        reservation_data["id"] = doc_ref[1].id
+        # Reservation and donor notification are written in one commit, with client-side IDs
+        reservation_ref = db.collection("reservations").document()
+        notification_ref = db.collection("notifications").document()
         
-        create_notification(
-            db=db,
+        batch = db.batch()
+        batch.set(reservation_ref, reservation_data)
+        batch.set(notification_ref, build_notification_data(
             title="New Reservation Request",
             message=f"Someone wants to reserve your item '{item_data.get('name', 'Unknown')}'",
             notification_type="reservation_request",
-            target_users=[item_data.get("donor_id")],
-            isAdminNotification=False
-        )
+            target_users=[item_data.get("donor_id")]
+        ))
+        await batch.commit()
+        reservation_data["id"] = reservation_ref.id
 
-        # Send emails to both donor and requester
-        try:
-            # Email to donor
-            await email_service.send_reservation_request_email(
-                item_data.get("donor_id"), 
-                item_data.get("donor_name", "Donor"), 
-                user_data.get("full_name", "User"), 
-                item_data, 
-                request.message
-            )
-            
-            # Email to requester
-            await email_service.send_reservation_confirmation_email(
-                user_data["email"], 
-                user_data.get("full_name", "User"), 
-                item_data.get("donor_name", "Donor"), 
-                item_data
-            )
-        except Exception as e:
-            logger.error(f"Failed to send reservation emails: {e}")
+        # Send emails to both donor and requester after the response
+        background_tasks.add_task(send_reservation_emails, item_data, user_data, request.message)
         
         return ApiResponse(
             success=True,
@@ -1456,8 +1511,9 @@ async def cancel_reservation(
 ):
     """Cancel a reservation"""
     try:
+        now = datetime.utcnow().isoformat()
         reservation_ref = db.collection("reservations").document(reservation_id)
-        reservation_doc = reservation_ref.get()
+        reservation_doc = await reservation_ref.get()
         
         if not reservation_doc.exists:
             raise HTTPException(
@@ -1475,10 +1531,10 @@ async def cancel_reservation(
             )
         
         # Update reservation status
-        reservation_ref.update({
+        await reservation_ref.update({
             "status": "cancelled",
-            "cancelled_at": datetime.utcnow().isoformat(),
-            "updated_at": datetime.utcnow().isoformat()
+            "cancelled_at": firestore.SERVER_TIMESTAMP,
+            "updated_at": now
         })
         
         
@@ -1499,13 +1555,15 @@ async def cancel_reservation(
 @app.put("/api/v1/reservations/{reservation_id}/status")
 async def update_reservation_status(
     reservation_id: str,
+    background_tasks: BackgroundTasks,
     status: str = Form(...),
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """Update reservation status (approve/decline) with automatic rejection logic and tracking"""
     try:
+        now = datetime.utcnow().isoformat()
         reservation_ref = db.collection("reservations").document(reservation_id)
-        reservation_doc = reservation_ref.get()
+        reservation_doc = await reservation_ref.get()
         
         if not reservation_doc.exists:
             raise HTTPException(
@@ -1515,9 +1573,9 @@ async def update_reservation_status(
         
         reservation_data = reservation_doc.to_dict()
         
-        # Get item details
+        # Get item details, only the fields this handler and its emails use
         item_ref = db.collection("items").document(reservation_data["item_id"])
-        item_doc = item_ref.get()
+        item_doc = await item_ref.get(field_paths=RESERVATION_ITEM_FIELDS)
         item_data = item_doc.to_dict()
         
         # Only donor can update reservation status
@@ -1527,54 +1585,43 @@ async def update_reservation_status(
                 detail="Only the donor can update reservation status"
             )
         
-        # Update reservation status
-        reservation_ref.update({
+        # Reservation, tracking, item, chat and notification writes go out in a single commit,
+        # so an approval is never left half applied
+        writes = []
+        reservation_update = {
             "status": status,
-            "updated_at": datetime.utcnow().isoformat()
-        })
+            "updated_at": now
+        }
+        reject_others = False
+        take_bulk_quantity = False
         
         if status == "approved":
             # Create tracking record
-            tracking_id = create_tracking_record(
-                db,
+            tracking_data = build_tracking_record(
                 reservation_id,
                 reservation_data["item_id"],
                 item_data.get("donor_id"),
                 reservation_data["user_id"]
             )
+            tracking_id = tracking_data["tracking_id"]
+            tracking_data["item"] = build_item_snapshot(item_data)
+            # Keyed by tracking ID so lookups are point reads; create() refuses to overwrite on a collision
+            writes.append(("create", db.collection("tracking").document(tracking_id), tracking_data))
             
             # Update reservation with tracking ID
-            reservation_ref.update({"tracking_id": tracking_id})
+            reservation_update["tracking_id"] = tracking_id
             
             # Handle bulk vs single item logic
             if item_data.get("is_bulk_item") and item_data.get("quantity", 0) > 1:
-                # For bulk items, decrease quantity
-                new_quantity = item_data.get("quantity", 1) - reservation_data.get("requested_quantity", 1)
-                if new_quantity <= 0:
-                    # All items taken, reject remaining requests
-                    item_ref.update({
-                        "status": "donated",
-                        "quantity": 0,
-                        "updated_at": datetime.utcnow().isoformat()
-                    })
-                    
-                    # Reject all other pending requests
-                    await reject_other_requests(reservation_data["item_id"], reservation_id, item_data)
-                else:
-                    # Update quantity
-                    item_ref.update({
-                        "quantity": new_quantity,
-                        "updated_at": datetime.utcnow().isoformat()
-                    })
+                # For bulk items, quantity is taken in a transaction below so concurrent approvals can't oversell
+                take_bulk_quantity = True
             else:
                 # For single items, mark as reserved and reject other requests
-                item_ref.update({
+                writes.append(("update", item_ref, {
                     "status": "reserved",
-                    "updated_at": datetime.utcnow().isoformat()
-                })
-                
-                # Reject all other pending requests
-                await reject_other_requests(reservation_data["item_id"], reservation_id, item_data)
+                    "updated_at": now
+                }))
+                reject_others = True
             
             # Create chat room for approved reservation
             chat_data = {
@@ -1582,51 +1629,68 @@ async def update_reservation_status(
                 "item_id": reservation_data["item_id"],
                 "donor_id": item_data.get("donor_id"),
                 "requester_id": reservation_data["user_id"],
-                "created_at": datetime.utcnow().isoformat(),
-                "last_message_at": datetime.utcnow().isoformat(),
-                "is_active": True
+                "created_at": now,
+                "last_message_at": now,
+                "is_active": True,
+                "item": build_item_snapshot(item_data),
+                # Messages live under chats/{chat_id}/messages instead of the shared collection
+                "messages_subcollection": True
             }
 
-            is_already_chat_room = db.collection("chats").where("item_id", "==", reservation_data["item_id"]).where("requester_id", "==", reservation_data["user_id"]).where("donor_id", "==", item_data.get("donor_id")).get()
+            chat_room_query = db.collection("chats").where("item_id", "==", reservation_data["item_id"]).where("requester_id", "==", reservation_data["user_id"]).where("donor_id", "==", item_data.get("donor_id"))
+            requester_ref = db.collection("users").document(reservation_data["user_id"])
+            
+            # The requester is only needed for the email, so fetch it alongside the chat check
+            is_already_chat_room, requester_doc = await asyncio.gather(
+                chat_room_query.get(),
+                requester_ref.get()
+            )
             
             if not is_already_chat_room:
-                db.collection("chats").add(chat_data)
+                writes.append(("set", db.collection("chats").document(), chat_data))
             
             # Send approval notification with tracking ID
-            create_notification(
-                db=db,
+            writes.append(("set", db.collection("notifications").document(), build_notification_data(
                 title="Request Approved! 🎉",
                 message=f"Great news! Your request for '{item_data.get('name', 'item')}' has been approved. Tracking ID: {tracking_id}. You can now track your item and chat with the donor.",
                 notification_type="reservation_approved",
-                target_users=[reservation_data["user_id"]],
-                isAdminNotification=False
-            )
-            
-            # Send tracking email
-            try:
-                requester_ref = db.collection("users").document(reservation_data["user_id"])
-                requester_doc = requester_ref.get()
-                requester_data = requester_doc.to_dict() if requester_doc.exists else {}
-                
-                await email_service.send_tracking_email(
-                    requester_data.get("email", ""),
-                    requester_data.get("full_name", "User"),
-                    item_data,
-                    tracking_id
-                )
-            except Exception as e:
-                logger.error(f"Failed to send tracking email: {e}")
+                target_users=[reservation_data["user_id"]]
+            )))
             
         elif status == "declined":
             # Send decline notification
-            create_notification(
-                db=db,
+            writes.append(("set", db.collection("notifications").document(), build_notification_data(
                 title="Request Declined",
                 message=f"Unfortunately, your request for '{item_data.get('name', 'item')}' was declined. Don't worry, there are many other items available!",
                 notification_type="reservation_declined",
-                target_users=[reservation_data["user_id"]],
-                isAdminNotification=False
+                target_users=[reservation_data["user_id"]]
+            )))
+        
+        # Update reservation status
+        writes.append(("update", reservation_ref, reservation_update))
+        
+        if take_bulk_quantity:
+            # The quantity read decides the item update, so every approval write commits with it,
+            # and remaining requests are rejected once all items are taken
+            reject_others = await take_item_quantity(
+                db.transaction(),
+                item_ref,
+                reservation_data.get("requested_quantity", 1),
+                now,
+                writes
             )
+        else:
+            await commit_writes(db, writes)
+        
+        if reject_others:
+            # Reject all other pending requests
+            await reject_other_requests(reservation_data["item_id"], reservation_id, item_data)
+        
+        if status == "approved":
+            # Send tracking email after the response
+            requester_data = requester_doc.to_dict() if requester_doc.exists else {}
+            background_tasks.add_task(send_tracking_email, requester_data, item_data, tracking_id)
+        
         return ApiResponse(
             success=True,
             message=f"Reservation {status} successfully",
@@ -1645,21 +1709,28 @@ async def update_reservation_status(
 async def reject_other_requests(item_id: str, approved_reservation_id: str, item_data: dict):
     """Reject all other pending requests for an item"""
     try:
+        now = datetime.utcnow().isoformat()
         # Get all pending requests for this item (excluding the approved one)
-        requests_query = db.collection("reservations").where("item_id", "==", item_id).where("status", "==", "pending")
-        requests_docs = list(requests_query.stream())
+        requests_query = (
+            db.collection("reservations")
+            .where("item_id", "==", item_id)
+            .where("status", "==", "pending")
+            .select(["user_id", "user_name", "email"])
+        )
+        requests_docs = [doc async for doc in requests_query.stream()]
         
         rejected_users = []
+        writes = []
         
         for request_doc in requests_docs:
             if request_doc.id != approved_reservation_id:
                 request_data = request_doc.to_dict()
                 
                 # Update status to declined
-                request_doc.reference.update({
+                writes.append(("update", request_doc.reference, {
                     "status": "declined",
-                    "updated_at": datetime.utcnow().isoformat()
-                })
+                    "updated_at": now
+                }))
                 
                 # Add to rejected users list
                 rejected_users.append({
@@ -1669,15 +1740,16 @@ async def reject_other_requests(item_id: str, approved_reservation_id: str, item
                 })
                 
                 # Send decline notification
-                create_notification(
-                    db=db,
+                writes.append(("set", db.collection("notifications").document(), build_notification_data(
                     title="Request Not Selected",
                     message=
                     f"Your request for '{item_data.get('name', 'item')}' was not selected. The donor chose another requester. Keep looking - there are many other great items available!",
                     notification_type="reservation_declined",
-                    target_users=[request_data["user_id"]],
-                    isAdminNotification=False
-                )
+                    target_users=[request_data["user_id"]]
+                )))
+        
+        # All declines and their notifications go out in batch commits instead of one write each
+        await commit_writes(db, writes)
         
         logger.info(f"Rejected {len(rejected_users)} other requests for item {item_id}")
         
@@ -1694,16 +1766,14 @@ async def get_tracking_info(
     try:
         # Find tracking record
         tracking_id = tracking_id.strip().upper()
-        tracking_query = db.collection("tracking").where("tracking_id", "==", tracking_id)
-        tracking_docs = list(tracking_query.stream())
+        tracking_doc = await get_tracking_doc(db, tracking_id)
         
-        if not tracking_docs:
+        if tracking_doc is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Tracking ID not found"
             )
         
-        tracking_doc = tracking_docs[0]
         tracking_data = tracking_doc.to_dict()
         tracking_data["id"] = tracking_doc.id
         
@@ -1715,15 +1785,14 @@ async def get_tracking_info(
                 detail="Access denied"
             )
         
-        # Get item details
+        # Get item and reservation details in one batched read
         item_ref = db.collection("items").document(tracking_data["item_id"])
-        item_doc = item_ref.get()
+        reservation_ref = db.collection("reservations").document(tracking_data["reservation_id"])
+        item_doc, reservation_doc = await get_documents(db, [item_ref, reservation_ref])
+        
         if item_doc.exists:
             tracking_data["item"] = item_doc.to_dict()
         
-        # Get reservation details
-        reservation_ref = db.collection("reservations").document(tracking_data["reservation_id"])
-        reservation_doc = reservation_ref.get()
         if reservation_doc.exists:
             tracking_data["reservation"] = reservation_doc.to_dict()
         
@@ -1754,16 +1823,14 @@ async def update_tracking_status_endpoint(
     """Update tracking status (donor only)"""
     try:
         # Find tracking record
-        tracking_query = db.collection("tracking").where("tracking_id", "==", tracking_id)
-        tracking_docs = list(tracking_query.stream())
+        tracking_doc = await get_tracking_doc(db, tracking_id)
         
-        if not tracking_docs:
+        if tracking_doc is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Tracking ID not found"
             )
         
-        tracking_doc = tracking_docs[0]
         tracking_data = tracking_doc.to_dict()
         
         # Only donor can update tracking status
@@ -1781,29 +1848,29 @@ async def update_tracking_status_endpoint(
             )
         
         # Update tracking status
-        update_tracking_status( db,tracking_id, request.status, request.notes, current_user["uid"])
+        await update_tracking_status( db,tracking_id, request.status, request.notes, current_user["uid"])
         if request.status == "completed" or request.status == "picked_up":
             # Update reservation status to completed
             reservation_ref = db.collection("reservations").document(tracking_data["reservation_id"])
-            reservation_ref.update({
+            await reservation_ref.update({
                 "status": "picked_up" ,
-                "completed_at": datetime.utcnow().isoformat(),
+                "completed_at": firestore.SERVER_TIMESTAMP,
                 "updated_at": datetime.utcnow().isoformat()
             })
             
             # Update item status to donated if not bulk item
             item_ref = db.collection("items").document(tracking_data["item_id"])
-            item_doc = item_ref.get()
+            item_doc = await item_ref.get()
             if item_doc.exists:
                 item_data = item_doc.to_dict()
                 if not item_data.get("is_bulk_item", False):
-                    item_ref.update({
+                    await item_ref.update({
                         "status": "donated",
                         "updated_at": datetime.utcnow().isoformat()
                     })
             
             # Send delivery notification
-            create_notification(
+            await create_notification(
                 db=db,
                 title="Item Delivered! 🎉",
                 message=f"The item '{item_data.get('name', 'item')}' has been marked as delivered. Thank you for donating!",
@@ -1826,6 +1893,37 @@ async def update_tracking_status_endpoint(
             detail="Failed to update tracking status"
         )
 
+async def get_tracking_details(tracking_docs: List[Any], include_requester: bool) -> List[Dict[str, Any]]:
+    """Attach item (and optionally requester) details to tracking records with one batched read"""
+    tracking_records = []
+    for tracking_doc in tracking_docs:
+        tracking_data = tracking_doc.to_dict()
+        tracking_data["id"] = tracking_doc.id
+        tracking_records.append(tracking_data)
+    
+    # Records created with an item snapshot don't need the item read
+    refs = [
+        db.collection("items").document(tracking_data["item_id"])
+        for tracking_data in tracking_records if "item" not in tracking_data
+    ]
+    if include_requester:
+        refs += [db.collection("users").document(tracking_data["requester_id"]) for tracking_data in tracking_records]
+    snapshots = await get_documents_by_path(db, refs)
+    
+    for tracking_data in tracking_records:
+        # Get item details
+        item_doc = snapshots.get(f"items/{tracking_data['item_id']}")
+        if "item" not in tracking_data and item_doc and item_doc.exists:
+            tracking_data["item"] = item_doc.to_dict()
+        
+        # Get requester details
+        if include_requester:
+            requester_doc = snapshots[f"users/{tracking_data['requester_id']}"]
+            if requester_doc.exists:
+                tracking_data["requester"] = requester_doc.to_dict()
+    
+    return tracking_records
+
 @app.get("/api/v1/user/tracking")
 async def get_user_tracking(
     current_user: Dict[str, Any] = Depends(get_current_user)
@@ -1833,20 +1931,9 @@ async def get_user_tracking(
     """Get all tracking records for current user (as requester)"""
     try:
         tracking_query = db.collection("tracking").where("requester_id", "==", current_user["uid"])
-        tracking_docs = tracking_query.stream()
+        tracking_docs = [doc async for doc in tracking_query.stream()]
         
-        tracking_records = []
-        for doc in tracking_docs:
-            tracking_data = doc.to_dict()
-            tracking_data["id"] = doc.id
-            
-            # Get item details
-            item_ref = db.collection("items").document(tracking_data["item_id"])
-            item_doc = item_ref.get()
-            if item_doc.exists:
-                tracking_data["item"] = item_doc.to_dict()
-            
-            tracking_records.append(tracking_data)
+        tracking_records = await get_tracking_details(tracking_docs, include_requester=False)
         
         tracking_records.sort(key=lambda x: x.get("created_at", ""), reverse=True)
         
@@ -1870,26 +1957,9 @@ async def get_donor_tracking(
     """Get all tracking records for current user (as donor)"""
     try:
         tracking_query = db.collection("tracking").where("donor_id", "==", current_user["uid"])
-        tracking_docs = tracking_query.stream()
+        tracking_docs = [doc async for doc in tracking_query.stream()]
         
-        tracking_records = []
-        for doc in tracking_docs:
-            tracking_data = doc.to_dict()
-            tracking_data["id"] = doc.id
-            
-            # Get item details
-            item_ref = db.collection("items").document(tracking_data["item_id"])
-            item_doc = item_ref.get()
-            if item_doc.exists:
-                tracking_data["item"] = item_doc.to_dict()
-            
-            # Get requester details
-            requester_ref = db.collection("users").document(tracking_data["requester_id"])
-            requester_doc = requester_ref.get()
-            if requester_doc.exists:
-                tracking_data["requester"] = requester_doc.to_dict()
-            
-            tracking_records.append(tracking_data)
+        tracking_records = await get_tracking_details(tracking_docs, include_requester=True)
         
         tracking_records.sort(key=lambda x: x.get("created_at", ""), reverse=True)
         
@@ -1908,26 +1978,15 @@ async def get_donor_tracking(
 async def get_unread_messages_count(id:str):
     try:
         # Get chats where user is either donor or requester
-        donor_chats_query = db.collection("chats").where("donor_id", "==", id)
-        requester_chats_query = db.collection("chats").where("requester_id", "==", id)
-        
-        donor_chats = list(donor_chats_query.stream())
-        requester_chats = list(requester_chats_query.stream())
-        
-        all_chats = donor_chats + requester_chats
+        all_chats = await user_chats_query(db, id).get()
 
-        unread_count = 0
-        for chat_doc in all_chats:
-            chat_data = chat_doc.to_dict()
-            chat_data["id"] = chat_doc.id
-            messages_query = db.collection("messages").where("chat_id", "==", chat_data["id"])
-            unread_messages_query = messages_query.where("read", "==", False).where("sender_id", "!=", id)
-
-            if unread_messages_query.get():
-                  unread_count += len(list(unread_messages_query.stream()))
-            else:
-                unread_count += 0
-        return unread_count
+        unread_counts = await asyncio.gather(*[
+            count_documents(
+                chat_messages_query(db, chat_doc.id, chat_doc.to_dict()).where("read", "==", False).where("sender_id", "!=", id)
+            )
+            for chat_doc in all_chats
+        ])
+        return sum(unread_counts)
         
     except Exception as e:
         logger.error(f"Error retrieving chats: {e}")
@@ -1936,6 +1995,42 @@ async def get_unread_messages_count(id:str):
             detail="Failed to retrieve chats"
         )
 
+def get_other_user_id(chat_data: Dict[str, Any], uid: str) -> str:
+    """The chat participant who is not uid"""
+    return chat_data["donor_id"] if chat_data["requester_id"] == uid else chat_data["requester_id"]
+
+async def get_chat_details(chat_doc, uid: str, snapshots: Dict[str, Any]) -> Dict[str, Any]:
+    """Attach item, other user, unread count and last message to a chat, using prefetched snapshots"""
+    chat_data = chat_doc.to_dict()
+    chat_data["id"] = chat_doc.id
+    
+    messages_query = chat_messages_query(db, chat_data["id"], chat_data)
+    last_message_query = messages_query.order_by("created_at", direction=firestore.Query.DESCENDING).limit(1)
+    unread_messages_query = messages_query.where("read", "==", False).where("sender_id", "!=", uid)
+    
+    unread_count, last_message_docs = await asyncio.gather(
+        count_documents(unread_messages_query),
+        last_message_query.get()
+    )
+    item_doc = snapshots.get(f"items/{chat_data['item_id']}")
+    user_doc = snapshots[f"users/{get_other_user_id(chat_data, uid)}"]
+    
+    # Get item details
+    if "item" not in chat_data and item_doc and item_doc.exists:
+        chat_data["item"] = item_doc.to_dict()
+    
+    chat_data["unread_count"] = unread_count
+    if last_message_docs:
+        last_message_data = last_message_docs[0].to_dict()
+        chat_data["last_message"] = last_message_data.get("message", "")
+        chat_data["last_message_at"] = last_message_data.get("created_at", "")
+    
+    # Get other user details
+    if user_doc.exists:
+        chat_data["other_user"] = user_doc.to_dict()
+    
+    return chat_data
+
 # Chat endpoints
 @app.get("/api/v1/chats")
 async def get_user_chats(
@@ -1944,46 +2039,22 @@ async def get_user_chats(
     """Get all chats for current user"""
     try:
         # Get chats where user is either donor or requester
-        donor_chats_query = db.collection("chats").where("donor_id", "==", current_user["uid"])
-        requester_chats_query = db.collection("chats").where("requester_id", "==", current_user["uid"])
-        
-        donor_chats = list(donor_chats_query.stream())
-        requester_chats = list(requester_chats_query.stream())
-        
-        all_chats = donor_chats + requester_chats
+        all_chats = await user_chats_query(db, current_user["uid"]).get()
         
-        chats = []
+        # Items and other users for every chat in one batched read
+        refs = []
         for chat_doc in all_chats:
             chat_data = chat_doc.to_dict()
-            chat_data["id"] = chat_doc.id
-            
-            # Get item details
-            item_ref = db.collection("items").document(chat_data["item_id"])
-            item_doc = item_ref.get()
-            if item_doc.exists:
-                chat_data["item"] = item_doc.to_dict()
-            
-            messages_query = db.collection("messages").where("chat_id", "==", chat_data["id"])
-            last_message_query = messages_query.order_by("created_at", direction=firestore.Query.DESCENDING).limit(1)
-            unread_messages_query = messages_query.where("read", "==", False).where("sender_id", "!=", current_user["uid"])
-            if unread_messages_query.get():
-                chat_data["unread_count"] = len(list(unread_messages_query.stream()))
-            else:
-                chat_data["unread_count"] = 0
-            last_message_docs = list(last_message_query.stream())
-            if last_message_docs:
-                last_message_data = last_message_docs[0].to_dict()
-                chat_data["last_message"] = last_message_data.get("message", "")
-                chat_data["last_message_at"] = last_message_data.get("created_at", "")
-
-            # Get other user details
-            other_user_id = chat_data["donor_id"] if chat_data["requester_id"] == current_user["uid"] else chat_data["requester_id"]
-            user_ref = db.collection("users").document(other_user_id)
-            user_doc = user_ref.get()
-            if user_doc.exists:
-                chat_data["other_user"] = user_doc.to_dict()
-            
-            chats.append(chat_data)
+            # Chats created with an item snapshot don't need the item read
+            if "item" not in chat_data:
+                refs.append(db.collection("items").document(chat_data["item_id"]))
+            refs.append(db.collection("users").document(get_other_user_id(chat_data, current_user["uid"])))
+        snapshots = await get_documents_by_path(db, refs)
+        
+        # Unread counts and last messages are per-chat queries; run them for all chats at once
+        chats = await asyncio.gather(*[
+            get_chat_details(chat_doc, current_user["uid"], snapshots) for chat_doc in all_chats
+        ])
         
         chats.sort(key=lambda x: x.get("last_message_at", ""), reverse=True)
         
@@ -2003,13 +2074,15 @@ async def get_user_chats(
 @app.get("/api/v1/chats/{chat_id}/messages")
 async def get_chat_messages(
     chat_id: str,
+    limit: int = Query(50, ge=1, le=200),
+    before: Optional[str] = Query(None),
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """Get messages for a specific chat"""
     try:
         # Verify user has access to this chat
         chat_ref = db.collection("chats").document(chat_id)
-        chat_doc = chat_ref.get()
+        chat_doc = await chat_ref.get()
         
         if not chat_doc.exists:
             raise HTTPException(
@@ -2024,20 +2097,24 @@ async def get_chat_messages(
                 detail="Access denied"
             )
         
-        # Get messages
-        messages_query = db.collection("messages").where("chat_id", "==", chat_id).order_by("created_at")
-        messages_docs = messages_query.stream()
+        # Get the newest page of messages, or the page older than "before"
+        messages_query = chat_messages_query(db, chat_id, chat_data).order_by("created_at", direction=firestore.Query.DESCENDING)
+        messages_docs = paginate_query(messages_query, limit, before).stream()
         
         messages = []
-        for message_doc in messages_docs:
+        async for message_doc in messages_docs:
             message_data = message_doc.to_dict()
             message_data["id"] = message_doc.id
             messages.append(message_data)
         
+        # Cursor for the next older page, taken before flipping to chronological order
+        next_before = next_page_cursor(messages, limit)
+        messages.reverse()
+        
         return ApiResponse(
             success=True,
             message="Messages retrieved successfully",
-            data={"messages": messages}
+            data={"messages": messages, "next_before": next_before}
         )
         
     except HTTPException as e:
@@ -2057,9 +2134,10 @@ async def send_message(
 ):
     """Send a message in a chat"""
     try:
+        now = datetime.utcnow().isoformat()
         # Verify user has access to this chat
         chat_ref = db.collection("chats").document(chat_id)
-        chat_doc = chat_ref.get()
+        chat_doc = await chat_ref.get()
         
         if not chat_doc.exists:
             raise HTTPException(
@@ -2079,16 +2157,16 @@ async def send_message(
             "chat_id": chat_id,
             "sender_id": current_user["uid"],
             "message": message,
-            "created_at": datetime.utcnow().isoformat(),
+            "created_at": now,
             "read": False
         }
         
-        doc_ref = db.collection("messages").add(message_data)
+        doc_ref = await chat_messages_collection(db, chat_id, chat_data).add(message_data)
         message_data["id"] = doc_ref[1].id
         
         # Update chat last message time
-        chat_ref.update({
-            "last_message_at": datetime.utcnow().isoformat(),
+        await chat_ref.update({
+            "last_message_at": now,
             "last_message": message
         })
         
@@ -2110,50 +2188,36 @@ async def send_message(
 # Notifications Routes
 @app.get("/api/v1/notifications")
 async def get_user_notifications(
-    page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """Get user notifications"""
     try:
-        # Get notifications targeted to this user or general notifications
-        notifications_query = db.collection("notifications").where("target_users", "array_contains", current_user["uid"])
-        notifications_docs = list(notifications_query.stream())
-        
-        # Also get general notifications (empty target_users)
-        general_notifications_query = db.collection("notifications").where("target_users", "==", [])
-        general_notifications_docs = list(general_notifications_query.stream())
+        read_up_to = await get_notifications_read_up_to(db, current_user["uid"])
         
-        all_notifications = notifications_docs + general_notifications_docs
+        # Get notifications targeted to this user or general notifications, one page newest first
+        notifications_query = user_notifications_query(db, current_user["uid"]).order_by("created_at", direction=firestore.Query.DESCENDING)
+        notifications_docs = paginate_query(notifications_query, limit, cursor).stream()
         
         notifications = []
-        for doc in all_notifications:
+        async for doc in notifications_docs:
             notification_data = doc.to_dict()
             notification_data["id"] = doc.id
-            notification_data["read"] = current_user["uid"] in notification_data.get("read_by", [])
+            notification_data["read"] = is_notification_read(notification_data, current_user["uid"], read_up_to)
             notifications.append(notification_data)
         
-        # Sort by created_at
-        notifications.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-        
-        # Paginate
-        start_idx = (page - 1) * limit
-        end_idx = start_idx + limit
-        paginated_notifications = notifications[start_idx:end_idx]
-        
-        # Count unread notifications
-        unread_count = len([n for n in notifications if not n["read"]])
+        total, unread_count = await get_notification_counts(current_user["uid"], read_up_to)
         
         return ApiResponse(
             success=True,
             message="Notifications retrieved successfully",
             data={
-                "notifications": paginated_notifications,
+                "notifications": notifications,
                 "unread_count": unread_count,
-                "total": len(notifications),
-                "page": page,
+                "total": total,
                 "limit": limit,
-                "total_pages": (len(notifications) + limit - 1) // limit
+                "next_cursor": next_page_cursor(notifications, limit)
             }
         )
         
@@ -2172,7 +2236,7 @@ async def get_notification_by_id(
     """Get notification by ID"""
     try:
         notification_ref = db.collection("notifications").document(notification_id)
-        notification_doc = notification_ref.get()
+        notification_doc = await notification_ref.get()
         
         if not notification_doc.exists:
             raise HTTPException(
@@ -2185,13 +2249,14 @@ async def get_notification_by_id(
         
         # Check if user has access to this notification
         target_users = notification_data.get("target_users", [])
-        if target_users and current_user["uid"] not in target_users:
+        if target_users and current_user["uid"] not in target_users and ALL_USERS_TARGET not in target_users:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied"
             )
         
-        notification_data["read"] = current_user["uid"] in notification_data.get("read_by", [])
+        read_up_to = await get_notifications_read_up_to(db, current_user["uid"])
+        notification_data["read"] = is_notification_read(notification_data, current_user["uid"], read_up_to)
         
         return ApiResponse(
             success=True,
@@ -2216,24 +2281,19 @@ async def mark_notification_read(
     """Mark notification as read"""
     try:
         notification_ref = db.collection("notifications").document(notification_id)
-        notification_doc = notification_ref.get()
         
-        if not notification_doc.exists:
+        # ArrayUnion adds the user server-side, so no read is needed and concurrent marks can't be lost
+        try:
+            await notification_ref.update({
+                "read_by": firestore.ArrayUnion([current_user["uid"]]),
+                "read_at": firestore.SERVER_TIMESTAMP
+            })
+        except NotFound:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Notification not found"
             )
         
-        notification_data = notification_doc.to_dict()
-        read_by = notification_data.get("read_by", [])
-        
-        if current_user["uid"] not in read_by:
-            read_by.append(current_user["uid"])
-            notification_ref.update({
-                "read_by": read_by,
-                "read_at": datetime.utcnow().isoformat()
-            })
-        
         return ApiResponse(
             success=True,
             message="Notification marked as read"
@@ -2254,34 +2314,30 @@ async def mark_all_notifications_read(
 ):
     """Mark all notifications as read for current user"""
     try:
-        # Get all notifications for this user
-        notifications_query = db.collection("notifications").where("target_users", "array_contains", current_user["uid"])
-        notifications_docs = list(notifications_query.stream())
-        
-        # Also get general notifications
-        general_notifications_query = db.collection("notifications").where("target_users", "==", [])
-        general_notifications_docs = list(general_notifications_query.stream())
+        read_up_to = await get_notifications_read_up_to(db, current_user["uid"])
+        _, updated_count = await get_notification_counts(current_user["uid"], read_up_to)
         
-        all_notifications = notifications_docs + general_notifications_docs
-        
-        updated_count = 0
-        for doc in all_notifications:
-            notification_data = doc.to_dict()
-            read_by = notification_data.get("read_by", [])
-            
-            if current_user["uid"] not in read_by:
-                read_by.append(current_user["uid"])
-                doc.reference.update({
-                    "read_by": read_by,
-                    "read_at": datetime.utcnow().isoformat()
-                })
-                updated_count += 1
+        # One cursor write on the user instead of appending to read_by on every notification,
+        # which also keeps general notifications from becoming hot documents
+        # update() rather than a merge set, so a caller without a profile can't create a stub user document
+        try:
+            await db.collection("users").document(current_user["uid"]).update(
+                {"notifications_read_up_to": datetime.utcnow().isoformat()}
+            )
+        except NotFound:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User profile not found"
+            )
+        invalidate_user_profile(current_user["uid"])
         
         return ApiResponse(
             success=True,
             message=f"Marked {updated_count} notifications as read"
         )
         
+    except HTTPException as e:
+        raise e
     except Exception as e:
         logger.error(f"Error marking all notifications as read: {e}")
         raise HTTPException(
@@ -2297,7 +2353,8 @@ async def delete_notification(
     """Delete notification (admin only or if user is in target_users)"""
     try:
         notification_ref = db.collection("notifications").document(notification_id)
-        notification_doc = notification_ref.get()
+        # The permission check needs target_users only
+        notification_doc = await notification_ref.get(field_paths=["target_users"])
         
         if not notification_doc.exists:
             raise HTTPException(
@@ -2315,7 +2372,7 @@ async def delete_notification(
                 detail="Access denied"
             )
         
-        notification_ref.delete()
+        await notification_ref.delete()
         
         return ApiResponse(
             success=True,
@@ -2331,27 +2388,36 @@ async def delete_notification(
             detail="Failed to delete notification"
         )
 
+async def get_notification_counts(uid: str, read_up_to: Optional[str] = None):
+    """Total and unread notification counts for a user, from aggregation queries only"""
+    visible_query = user_notifications_query(db, uid)
+    read_query = db.collection("notifications").where("read_by", "array_contains", uid)
+    
+    # Everything up to the mark-all-read cursor is read, so only newer notifications can be unread
+    if read_up_to:
+        total, newer_total, newer_read_total = await asyncio.gather(
+            count_documents(visible_query),
+            count_documents(visible_query.where("created_at", ">", read_up_to)),
+            count_documents(read_query.where("created_at", ">", read_up_to))
+        )
+    else:
+        total, read_total = await asyncio.gather(
+            count_documents(visible_query),
+            count_documents(read_query)
+        )
+        newer_total, newer_read_total = total, read_total
+    
+    # Firestore has no "not contains" filter, but every notification a user has read
+    # is either targeted at them or general, so unread = visible - read
+    return total, max(newer_total - newer_read_total, 0)
+
 async def get_unread_notifications_count(
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """Get count of unread notifications"""
     try:
-        # Get notifications targeted to this user
-        notifications_query = db.collection("notifications").where("target_users", "array_contains", current_user["uid"])
-        notifications_docs = list(notifications_query.stream())
-        
-        # Also get general notifications
-        general_notifications_query = db.collection("notifications").where("target_users", "==", [])
-        general_notifications_docs = list(general_notifications_query.stream())
-        
-        all_notifications = notifications_docs + general_notifications_docs
-        
-        unread_count = 0
-        for doc in all_notifications:
-            notification_data = doc.to_dict()
-            if current_user["uid"] not in notification_data.get("read_by", []):
-                unread_count += 1
-        
+        read_up_to = await get_notifications_read_up_to(db, current_user["uid"])
+        _, unread_count = await get_notification_counts(current_user["uid"], read_up_to)
         return  unread_count
         
     except Exception as e:
@@ -2364,12 +2430,22 @@ async def get_unread_notifications_count(
 @app.get("/api/v1/reservations/{reservation_id}")
 async def get_reservation_by_id(
     reservation_id: str,
+    fields: Optional[List[str]] = Query(None),
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
-    """Get reservation by ID"""
+    """Get reservation by ID, optionally only the requested fields"""
     try:
+        if fields:
+            unknown_fields = [field for field in fields if field not in RESERVATION_FIELDS]
+            if unknown_fields:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown reservation fields: {', '.join(unknown_fields)}"
+                )
+        
         reservation_ref = db.collection("reservations").document(reservation_id)
-        reservation_doc = reservation_ref.get()
+        field_paths = list(dict.fromkeys(fields + RESERVATION_REQUIRED_FIELDS)) if fields else None
+        reservation_doc = await reservation_ref.get(field_paths=field_paths)
         
         if not reservation_doc.exists:
             raise HTTPException(
@@ -2388,11 +2464,12 @@ async def get_reservation_by_id(
                 detail="Access denied"
             )
         
-        # Get item details
-        item_ref = db.collection("items").document(reservation_data["item_id"])
-        item_doc = item_ref.get()
-        if item_doc.exists:
-            reservation_data["item"] = item_doc.to_dict()
+        # Reservations created with an item snapshot don't need the item read
+        if "item" not in reservation_data and (not fields or "item" in fields):
+            item_ref = db.collection("items").document(reservation_data["item_id"])
+            item_doc = await item_ref.get()
+            if item_doc.exists:
+                reservation_data["item"] = item_doc.to_dict()
         
         return ApiResponse(
             success=True,
@@ -2412,50 +2489,55 @@ async def get_reservation_by_id(
 @app.get("/api/v1/items/{item_id}/requests")
 async def get_item_requests(
     item_id: str,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """Get all reservation requests for an item"""
     try:
         # Verify user owns the item
-        item_ref = db.collection("items").document(item_id)
-        item_doc = item_ref.get()
+        donor_id = await get_item_donor_id(db, item_id)
         
-        if not item_doc.exists:
+        if donor_id is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Item not found"
             )
         
-        item_data = item_doc.to_dict()
-        if item_data.get("donor_id") != current_user["uid"]:
+        if donor_id != current_user["uid"]:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied"
             )
         
-        # Get all requests for this item
-        requests_query = db.collection("reservations").where("item_id", "==", item_id)
-        requests_docs = requests_query.stream()
+        # Get one page of requests for this item, newest first
+        requests_query = (
+            db.collection("reservations")
+            .where("item_id", "==", item_id)
+            .select(ITEM_REQUEST_FIELDS)
+            .order_by("created_at", direction=firestore.Query.DESCENDING)
+        )
+        requests_docs = paginate_query(requests_query, limit, cursor).stream()
         
         requests = []
-        for doc in requests_docs:
+        async for doc in requests_docs:
             request_data = doc.to_dict()
             request_data["id"] = doc.id
-            
-            # Get requester details
-            user_ref = db.collection("users").document(request_data["user_id"])
-            user_doc = user_ref.get()
-            if user_doc.exists:
-                request_data["requester"] = user_doc.to_dict()
-            
             requests.append(request_data)
         
-        requests.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+        # Get requester details in one batched read
+        user_docs = await get_documents_by_path(
+            db, [db.collection("users").document(r["user_id"]) for r in requests], REQUESTER_PROFILE_FIELDS
+        )
+        for request_data in requests:
+            user_doc = user_docs[f"users/{request_data['user_id']}"]
+            if user_doc.exists:
+                request_data["requester"] = user_doc.to_dict()
         
         return ApiResponse(
             success=True,
             message="Item requests retrieved successfully",
-            data={"reservations": requests}
+            data={"reservations": requests, "next_cursor": next_page_cursor(requests, limit)}
         )
         
     except HTTPException as e:
@@ -2467,26 +2549,26 @@ async def get_item_requests(
             detail="Failed to retrieve item requests"
         )
 async def get_donor_reservations_data(
-    id: str
+    id: str,
+    doc_cache: Optional[Dict[str, Any]] = None
 ):
     try:
+        doc_cache = {} if doc_cache is None else doc_cache
         reservations_query = db.collection("reservations").where("donor_id", "==", id)
         reservations_docs = reservations_query.stream()
         
         reservations = []
-        for doc in reservations_docs:
+        async for doc in reservations_docs:
             reservation_data = doc.to_dict()
             reservation_data["id"] = doc.id
             
             # Get item details
-            item_ref = db.collection("items").document(reservation_data["item_id"])
-            item_doc = item_ref.get()
+            item_doc = await cached_get(db, doc_cache, f"items/{reservation_data['item_id']}")
             if item_doc.exists:
                 reservation_data["item"] = item_doc.to_dict()
             
             # Get requester details
-            requester_ref = db.collection("users").document(reservation_data["user_id"])
-            requester_doc = requester_ref.get()
+            requester_doc = await cached_get(db, doc_cache, f"users/{reservation_data['user_id']}")
             if requester_doc.exists:
                 requester_data = requester_doc.to_dict()
                 reservation_data["user"] = {
@@ -2511,11 +2593,12 @@ async def get_donor_reservations_data(
 
 @app.get("/api/v1/donor/reservations")
 async def get_donor_reservations(
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    doc_cache: Dict[str, Any] = Depends(get_doc_cache)
 ):
     """Get all reservation requests received by current user (as donor)"""
     try:
-        reservations = await get_donor_reservations_data(current_user["uid"])
+        reservations = await get_donor_reservations_data(current_user["uid"], doc_cache)
         
         return ApiResponse(
             success=True,
@@ -2546,7 +2629,7 @@ async def send_image_message(
         
         # Verify user has access to this chat
         chat_ref = db.collection("chats").document(chat_id)
-        chat_doc = chat_ref.get()
+        chat_doc = await chat_ref.get()
         
         if not chat_doc.exists:
             raise HTTPException(
@@ -2562,16 +2645,14 @@ async def send_image_message(
             )
         
         # Validate file type
-        allowed_types = ['image/jpeg', 'image/png', 'image/gif', 'image/webp']
-        if image.content_type not in allowed_types:
+        if not await is_valid_image(image):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid file type. Only images are allowed."
             )
         
         # Upload image to storage
-        file_content = await image.read()
-        image_url = upload_file_to_storage(bucket, file_content, f"chat_{chat_id}_{image.filename}", image.content_type)
+        image_url = await upload_file_to_storage_async(bucket, image.file, f"chat_{chat_id}_{image.filename}", image.content_type)
         
         # Create message with image
         message_data = {
@@ -2583,11 +2664,11 @@ async def send_image_message(
             "read": False
         }
         
-        doc_ref = db.collection("messages").add(message_data)
+        doc_ref = await chat_messages_collection(db, chat_id, chat_data).add(message_data)
         message_data["id"] = doc_ref[1].id
         
         # Update chat last message time
-        chat_ref.update({
+        await chat_ref.update({
             "last_message_at": datetime.utcnow().isoformat(),
             "last_message": "📷 Image"
         })
@@ -2615,7 +2696,7 @@ async def get_user_status(
     """Get user online status and last seen"""
     try:
         user_ref = db.collection("users").document(user_id)
-        user_doc = user_ref.get()
+        user_doc = await user_ref.get()
         
         if not user_doc.exists:
             raise HTTPException(
@@ -2632,7 +2713,8 @@ async def get_user_status(
             is_online=(datetime.utcnow() - datetime.fromisoformat(isOnline_check)) < timedelta(minutes=2)
 
         # Check if the user is online
-        user_ref.update({"is_online": is_online})
+        await user_ref.update({"is_online": is_online})
+        invalidate_user_profile(user_id)
         
         user_data = user_doc.to_dict()
         
@@ -2673,7 +2755,8 @@ async def update_user_status(
         if typing_in_chat is not None:
             update_data["typing_in_chat"] = typing_in_chat
         
-        user_ref.update(update_data)
+        await user_ref.update(update_data)
+        invalidate_user_profile(current_user["uid"])
         
         return ApiResponse(
             success=True,
@@ -2696,7 +2779,7 @@ async def mark_messages_as_read(
     try:
         # Verify user has access to this chat
         chat_ref = db.collection("chats").document(chat_id)
-        chat_doc = chat_ref.get()
+        chat_doc = await chat_ref.get()
         
         if not chat_doc.exists:
             raise HTTPException(
@@ -2714,14 +2797,14 @@ async def mark_messages_as_read(
         # Mark all unread messages from other user as read
         other_user_id = chat_data["donor_id"] if chat_data["requester_id"] == current_user["uid"] else chat_data["requester_id"]
         
-        messages_query = db.collection("messages").where("chat_id", "==", chat_id).where("sender_id", "==", other_user_id).where("read", "==", False)
+        messages_query = chat_messages_query(db, chat_id, chat_data).where("sender_id", "==", other_user_id).where("read", "==", False)
         messages_docs = messages_query.stream()
         
         batch = db.batch()
-        for message_doc in messages_docs:
+        async for message_doc in messages_docs:
             batch.update(message_doc.reference, {"read": True})
         
-        batch.commit()
+        await batch.commit()
         
         return ApiResponse(
             success=True,
@@ -2751,7 +2834,7 @@ async def get_user_by_id(
     
     try:
         user_ref = db.collection("users").document(user_id)
-        user_doc = user_ref.get()
+        user_doc = await user_ref.get()
         
         if not user_doc.exists:
             raise HTTPException(
@@ -2764,15 +2847,18 @@ async def get_user_by_id(
         # Get user statistics
         # Count donations
         donations_query = db.collection("items").where("donor_id", "==", user_id)
-        donations_count = len(list(donations_query.stream()))
-        print(donations_count)
         # Count reservations
         reservations_query = db.collection("reservations").where("user_id", "==", user_id)
-        reservations_count = len(list(reservations_query.stream()))
         
         # Count completed pickups
         pickups_query = db.collection("reservations").where("user_id", "==", user_id).where("status", "==", "picked_up")
-        pickups_count = len(list(pickups_query.stream()))
+        
+        # The three counts are independent, so run them concurrently
+        donations_count, reservations_count, pickups_count = await asyncio.gather(
+            count_documents(donations_query),
+            count_documents(reservations_query),
+            count_documents(pickups_query)
+        )
         
         # Add statistics to user data
         user_data["stats"] = {
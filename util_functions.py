@@ -1,29 +1,43 @@
 
+import asyncio
+import copy
+import base64
+import hashlib
+import json
 import logging
+import os
+import re
+import unicodedata
 import uuid
-import string
-import random
-from fastapi import HTTPException, status, Header
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import secrets
+from fastapi import HTTPException, status, Header, Request, UploadFile
+from typing import Dict, Any, List, Optional, BinaryIO
+from datetime import date, datetime
+from functools import lru_cache
+from cachetools import TTLCache
+from google.cloud import firestore
+from google.api_core.exceptions import AlreadyExists, NotFound
+from google.cloud.firestore_v1.base_query import FieldFilter, Or
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
-def upload_file_to_storage(bucket, file_content: bytes, filename: str, content_type: str) -> str:
-    """Upload file to Firebase Storage and return public URL"""
+# Chunk size for resumable uploads, so memory stays bounded regardless of file size
+UPLOAD_CHUNK_SIZE = 8 << 20
+
+def upload_file_to_storage(bucket, file_obj: BinaryIO, filename: str, content_type: str) -> str:
+    """Stream a file object to Firebase Storage and return public URL (blocking, run it in a thread)"""
     try:
         # Generate unique filename
         file_extension = filename.split('.')[-1] if '.' in filename else 'jpg'
         unique_filename = f"{uuid.uuid4()}.{file_extension}"
         
-        # Upload to storage
-        blob = bucket.blob(f"images/{unique_filename}")
-        blob.upload_from_string(file_content, content_type=content_type)
-        
-        # Make blob publicly accessible
-        blob.make_public()
+        # Upload to storage in chunks
+        blob = bucket.blob(f"images/{unique_filename}", chunk_size=UPLOAD_CHUNK_SIZE)
+        blob.upload_from_file(file_obj, content_type=content_type)
         
+        # The bucket grants public read at bucket level, so no per-object ACL call is needed
         return blob.public_url
     except Exception as e:
         logger.error(f"Error uploading file: {e}")
@@ -32,6 +46,40 @@ def upload_file_to_storage(bucket, file_content: bytes, filename: str, content_t
             detail="Failed to upload file"
         )
 
+ALLOWED_IMAGE_TYPES = frozenset({"image/jpeg", "image/png", "image/gif", "image/webp"})
+
+# Enough of the file to recognise every allowed image signature
+IMAGE_SNIFF_BYTES = 512
+
+def sniff_image_type(header: bytes) -> Optional[str]:
+    """Detect an allowed image MIME type from the file's leading bytes"""
+    if header.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if header[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+async def is_valid_image(file: UploadFile) -> bool:
+    """Check the declared content type and the magic bytes without reading the whole upload"""
+    if file.content_type not in ALLOWED_IMAGE_TYPES:
+        return False
+    header = await file.read(IMAGE_SNIFF_BYTES)
+    await file.seek(0)
+    return sniff_image_type(header) is not None
+
+# The Storage SDK is blocking; uploads get their own pool instead of sharing the loop's small default executor
+STORAGE_UPLOAD_WORKERS = 40
+storage_executor = ThreadPoolExecutor(max_workers=STORAGE_UPLOAD_WORKERS, thread_name_prefix="storage")
+
+async def upload_file_to_storage_async(bucket, file_obj: BinaryIO, filename: str, content_type: str) -> str:
+    """Run upload_file_to_storage on the dedicated storage thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(storage_executor, upload_file_to_storage, bucket, file_obj, filename, content_type)
+
 def verify_firebase_token(uid: str) -> Dict[str, Any]:
     try:
         if not uid:
@@ -65,64 +113,475 @@ async def get_current_user(authorization: Optional[str] = Header(None)) -> Dict[
 
     return verify_firebase_token(uid)
 
+def get_doc_cache(request: Request) -> Dict[str, Any]:
+    """Per-request cache of document snapshots keyed by document path"""
+    if not hasattr(request.state, "doc_cache"):
+        request.state.doc_cache = {}
+    return request.state.doc_cache
+
+async def cached_get(db, cache: Dict[str, Any], path: str):
+    """Get a document snapshot, reusing one already fetched during this request"""
+    # Cache the pending read itself so concurrent lookups of the same path share one RPC
+    if path not in cache:
+        cache[path] = asyncio.ensure_future(db.document(path).get())
+    return await cache[path]
+
+async def get_documents_by_path(db, refs: List[Any], field_paths: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Fetch several documents in one batched read, keyed by document path"""
+    unique_refs = list({ref.path: ref for ref in refs}.values())
+    if not unique_refs:
+        return {}
+    return {snapshot.reference.path: snapshot async for snapshot in db.get_all(unique_refs, field_paths=field_paths)}
+
+async def get_documents(db, refs: List[Any]) -> List[Any]:
+    """Fetch several documents in one batched read, returned in the same order as refs"""
+    snapshots = await get_documents_by_path(db, refs)
+    return [snapshots[ref.path] for ref in refs]
+
+async def count_documents(query) -> int:
+    """Count matching documents with a server-side aggregation query"""
+    result = await query.count().get()
+    return result[0][0].value
+
+# Public item listings (category, search) are cached briefly per process and dropped on item writes
+ITEM_LIST_CACHE_TTL = 30
+item_list_cache: TTLCache = TTLCache(maxsize=512, ttl=ITEM_LIST_CACHE_TTL)
+
+def compute_etag(payload: Any) -> str:
+    """Strong ETag for a JSON-serializable payload"""
+    body = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return f'"{hashlib.sha1(body).hexdigest()}"'
+
+def invalidate_item_list_cache():
+    """Drop cached item listings after an item is created, changed or deleted"""
+    item_list_cache.clear()
+
+# Read-mostly lookups shared across requests: user profiles briefly, item owners until the item is deleted
+USER_PROFILE_CACHE_TTL = 30
+user_profile_cache: TTLCache = TTLCache(maxsize=4096, ttl=USER_PROFILE_CACHE_TTL)
+ITEM_OWNER_CACHE_TTL = 300
+item_owner_cache: TTLCache = TTLCache(maxsize=4096, ttl=ITEM_OWNER_CACHE_TTL)
+
+async def get_cached_user_profile(db, uid: str) -> Optional[Dict[str, Any]]:
+    """User document data, served from user_profile_cache when fresh. None if the user doesn't exist"""
+    if uid not in user_profile_cache:
+        user_doc = await db.collection("users").document(uid).get()
+        if not user_doc.exists:
+            return None
+        user_profile_cache[uid] = user_doc.to_dict()
+    # Callers add keys to the result, so never hand out the cached dict itself
+    return copy.deepcopy(user_profile_cache[uid])
+
+def invalidate_user_profile(uid: str):
+    """Drop a cached user profile after the user document is written"""
+    user_profile_cache.pop(uid, None)
+
+async def get_item_donor_id(db, item_id: str) -> Optional[str]:
+    """donor_id of an item for ownership checks, cached since it never changes. None if the item doesn't exist"""
+    if item_id not in item_owner_cache:
+        item_doc = await db.collection("items").document(item_id).get(field_paths=["donor_id"])
+        if not item_doc.exists:
+            return None
+        item_owner_cache[item_id] = item_doc.to_dict().get("donor_id")
+    return item_owner_cache[item_id]
+
+def invalidate_item_owner(item_id: str):
+    """Drop a cached item owner after the item is deleted"""
+    item_owner_cache.pop(item_id, None)
+
+# Cursor pagination for list endpoints ordered by created_at
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+# Shared query builders for the hot list endpoints; each matches a composite index in firestore.indexes.json
+def available_items_query(db, category: Optional[str] = None):
+    """Items open for reservation, optionally limited to one category"""
+    query = db.collection("items").where(filter=FieldFilter("status", "==", "available"))
+    if category:
+        query = query.where(filter=FieldFilter("category", "==", category))
+    return query
+
+def donor_items_query(db, donor_id: str):
+    """Items donated by a user"""
+    return db.collection("items").where(filter=FieldFilter("donor_id", "==", donor_id))
+
+def user_reservations_query(db, user_id: str, reservation_status: Optional[str] = None):
+    """Reservations made by a user, optionally limited to one status"""
+    query = db.collection("reservations").where(filter=FieldFilter("user_id", "==", user_id))
+    if reservation_status:
+        query = query.where(filter=FieldFilter("status", "==", reservation_status))
+    return query
+
+def user_chats_query(db, uid: str):
+    """Chats where the user is either the donor or the requester, as a single OR query"""
+    return db.collection("chats").where(filter=Or([
+        FieldFilter("donor_id", "==", uid),
+        FieldFilter("requester_id", "==", uid)
+    ]))
+
+def chat_messages_collection(db, chat_id: str, chat_data: Dict[str, Any]):
+    """Collection new messages of a chat are written to"""
+    if chat_data.get("messages_subcollection"):
+        return db.collection("chats").document(chat_id).collection("messages")
+    return db.collection("messages")
+
+def chat_messages_query(db, chat_id: str, chat_data: Dict[str, Any]):
+    """Messages of a chat: its messages subcollection, or the shared collection for chats created before it"""
+    if chat_data.get("messages_subcollection"):
+        return db.collection("chats").document(chat_id).collection("messages")
+    return db.collection("messages").where("chat_id", "==", chat_id)
+
+# target_users entry that makes a notification visible to everyone
+ALL_USERS_TARGET = "__ALL__"
+
+def user_notifications_query(db, uid: str):
+    """Notifications visible to a user, targeted at them or global, as a single OR query"""
+    return db.collection("notifications").where(filter=Or([
+        FieldFilter("target_users", "array_contains_any", [uid, ALL_USERS_TARGET]),
+        # General notifications written before the ALL_USERS_TARGET sentinel
+        FieldFilter("target_users", "==", [])
+    ]))
+
+async def get_notifications_read_up_to(db, uid: str) -> Optional[str]:
+    """created_at of the newest notification the user has marked read in bulk, if any"""
+    user_doc = await db.collection("users").document(uid).get(field_paths=["notifications_read_up_to"])
+    return (user_doc.to_dict() or {}).get("notifications_read_up_to") if user_doc.exists else None
+
+def is_notification_read(notification_data: Dict[str, Any], uid: str, read_up_to: Optional[str]) -> bool:
+    """Read individually (read_by) or covered by the user's mark-all-read cursor"""
+    if uid in notification_data.get("read_by", []):
+        return True
+    return bool(read_up_to) and notification_data.get("created_at", "") <= read_up_to
+
+# Fields returned by item listings; description and search_tokens are left out to keep pages small
+ITEM_LIST_FIELDS = [
+    "name", "category", "food_type", "images", "status", "likes", "views", "quantity",
+    "is_bulk_item", "is_for_sale", "price", "expiry_date", "pickup_times", "location",
+    "donor", "donor_id", "donor_name", "is_verified", "created_at"
+]
+
+# Item fields copied onto tracking and chat documents so their list views need no item reads
+ITEM_SNAPSHOT_FIELDS = ["name", "category", "images", "location", "pickup_times"]
+
+# Item fields read when a donor approves or declines a reservation
+RESERVATION_ITEM_FIELDS = ITEM_SNAPSHOT_FIELDS + ["donor_id", "donor_name", "is_bulk_item", "quantity", "status"]
+
+# User profile fields the item and request endpoints actually use
+DONOR_PROFILE_FIELDS = ["uid", "full_name", "account_type", "photo_url", "phoneNumber", "email"]
+REQUESTER_PROFILE_FIELDS = ["uid", "full_name", "photo_url", "rating", "phoneNumber", "email"]
+
+# Reservation fields shown in an item's request list; the item snapshot and location are the same on every row
+ITEM_REQUEST_FIELDS = [
+    "item_id", "user_id", "user_name", "donor_id", "message", "requested_quantity",
+    "status", "tracking_id", "created_at", "updated_at"
+]
+
+# Reservation fields always read, so access checks and the item fallback work with any field mask
+RESERVATION_REQUIRED_FIELDS = ["user_id", "donor_id", "item_id"]
+
+# Top-level reservation fields a caller may ask for with ?fields=
+RESERVATION_FIELDS = frozenset(RESERVATION_REQUIRED_FIELDS + [
+    "item_name", "user_name", "message", "requested_quantity", "status", "location", "item",
+    "tracking_id", "created_at", "updated_at", "cancelled_at", "picked_up_at", "completed_at"
+])
+
+def build_item_snapshot(item_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Denormalized copy of the item fields shown next to a reservation, tracking record or chat"""
+    return {field: item_data.get(field) for field in ITEM_SNAPSHOT_FIELDS}
+
+def paginate_query(query, limit: int, cursor: Optional[str] = None):
+    """Limit a created_at-ordered query to one page, starting after the cursor"""
+    if cursor:
+        query = query.start_after({"created_at": cursor})
+    return query.limit(limit)
+
+def next_page_cursor(page_docs: List[Dict[str, Any]], limit: int) -> Optional[str]:
+    """Cursor for the page after this one, or None on the last page"""
+    if len(page_docs) < limit:
+        return None
+    return page_docs[-1].get("created_at")
+
+# sortBy values the main item feed accepts and the stored field each sorts on; anything else falls back to created_at
+ITEM_SORT_FIELDS = {"created_at": "created_at", "expiry_date": "expiry_date", "name": "name_lower"}
+
+def order_by_field_and_id(query, field: str, direction: str):
+    """Order a query by field, then by document ID so items with the same value keep a stable order"""
+    return query.order_by(field, direction=direction).order_by("__name__", direction=direction)
+
+def encode_sort_cursor(item_data: Dict[str, Any], field: str) -> str:
+    """Opaque cursor holding the sort value and document ID of the last item on a page"""
+    return base64.urlsafe_b64encode(json.dumps([item_data.get(field), item_data["id"]]).encode()).decode()
+
+def start_after_sort_cursor(query, cursor: str, field: str):
+    """Start a query from order_by_field_and_id after the item an encode_sort_cursor cursor points at"""
+    try:
+        value, doc_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return query.start_after({field: value, "__name__": doc_id})
+
+async def fetch_item_page(query, limit: int, sort_field: str):
+    """Read one limited page of an order_by_field_and_id query. Returns the items and the next page's cursor"""
+    items = []
+    for doc in await query.get():
+        item_data = doc.to_dict()
+        item_data["id"] = doc.id
+        items.append(item_data)
+    next_cursor = encode_sort_cursor(items[-1], sort_field) if len(items) == limit else None
+    return items, next_cursor
+
+# Most item documents one search request reads while filling its page
+SEARCH_SCAN_LIMIT = 1000
 
-def create_notification(db,title: str, message: str, notification_type: str,isAdminNotification:bool, target_users: List[str] = None):
+async def fetch_search_page(query, search_tokens: List[str], limit: int, skip: int, sort_field: str):
+    """Fill a page with items containing every search word, after skipping skip of them. Returns the items and the next page's cursor"""
+    items = []
+    scanned = 0
+    last_item = None
+    while scanned < SEARCH_SCAN_LIMIT:
+        batch_docs = await query.limit(limit).get()
+        for doc in batch_docs:
+            last_item = doc.to_dict()
+            last_item["id"] = doc.id
+            # array_contains_any matched at least one word; require all of them
+            if not all(token in last_item.get("search_tokens", []) for token in search_tokens):
+                continue
+            if skip:
+                skip -= 1
+                continue
+            items.append(last_item)
+            if len(items) == limit:
+                return items, encode_sort_cursor(last_item, sort_field)
+        if len(batch_docs) < limit:
+            return items, None
+        scanned += len(batch_docs)
+        query = query.start_after(batch_docs[-1])
+    # Scan budget used up: return a short page whose cursor resumes after the last row read
+    return items, encode_sort_cursor(last_item, sort_field)
+
+async def backfill_item_sort_fields(db) -> int:
+    """Give older items the fields the item feed sorts on, so ordering by them doesn't drop those items"""
+    writes = []
+    async for doc in db.collection("items").select(["name", "name_lower", "expiry_date"]).stream():
+        item_data = doc.to_dict()
+        update_data = {}
+        name_lower = (item_data.get("name") or "").lower()
+        if item_data.get("name_lower") != name_lower:
+            update_data["name_lower"] = name_lower
+        if "expiry_date" not in item_data:
+            # order_by skips documents without the field, but keeps explicit nulls
+            update_data["expiry_date"] = None
+        if update_data:
+            writes.append(("update", doc.reference, update_data))
+    await commit_writes(db, writes)
+    return len(writes)
+
+# Firestore allows at most 500 writes in one batch commit
+MAX_BATCH_WRITES = 500
+
+async def commit_writes(db, writes: List[tuple]):
+    """Commit (method, ref, data) writes, e.g. ("update", ref, {...}), in as few batches as possible"""
+    for start in range(0, len(writes), MAX_BATCH_WRITES):
+        batch = db.batch()
+        for method, ref, data in writes[start:start + MAX_BATCH_WRITES]:
+            getattr(batch, method)(ref, data)
+        await batch.commit()
+
+def build_notification_data(title: str, message: str, notification_type: str, target_users: List[str] = None) -> Dict[str, Any]:
+    """Build a notification document, for callers that write it as part of a batch"""
+    return {
+        "title": title,
+        "message": message,
+        "type": notification_type,
+        "target_users": target_users or [ALL_USERS_TARGET],
+        "created_at": datetime.utcnow().isoformat(),
+        "read_by": []
+    }
+
+async def create_notification(db,title: str, message: str, notification_type: str,isAdminNotification:bool, target_users: List[str] = None):
     """Create notification in database"""
     try:
-        notification_data = {
-            "title": title,
-            "message": message,
-            "type": notification_type,
-            "target_users": target_users or [],
-            "created_at": datetime.utcnow().isoformat(),
-            "read_by": []
-        }
+        notification_data = build_notification_data(title, message, notification_type, target_users)
         if isAdminNotification:
-            db.collection("admin-notifications").add(notification_data)
+            await db.collection("admin-notifications").add(notification_data)
         else:
-            db.collection("notifications").add(notification_data)
+            await db.collection("notifications").add(notification_data)
         logger.info(f"Notification created: {title}")
     except Exception as e:
         logger.error(f"Error creating notification: {e}")
 
+# Likes and favorites created before they were keyed by user and item have auto-generated IDs.
+# Run POST /api/v1/admin/migrations/keyed-likes once to rewrite them; until then set this to true
+# so those older documents are still found. Remove the flag once every deployment has migrated.
+LEGACY_KEYED_DOC_FALLBACK = os.getenv("LEGACY_KEYED_DOC_FALLBACK", "false").lower() == "true"
+
+async def create_keyed_or_legacy(db, doc_ref, collection: str, item_id: str, user_id: str, data: Dict[str, Any]) -> bool:
+    """Create a user/item keyed document unless it (or, with the legacy fallback, an auto-id one) exists. Returns False if one did"""
+    if LEGACY_KEYED_DOC_FALLBACK:
+        existing_docs = await db.collection(collection).where("item_id", "==", item_id).where("user_id", "==", user_id).limit(1).get()
+        if existing_docs:
+            return False
+    try:
+        await doc_ref.create(data)
+        return True
+    except AlreadyExists:
+        return False
+
+async def delete_keyed_or_legacy(db, doc_ref, collection: str, item_id: str, user_id: str) -> int:
+    """Delete a user/item keyed document (and, with the legacy fallback, auto-id duplicates). Returns how many were deleted"""
+    if LEGACY_KEYED_DOC_FALLBACK:
+        # The keyed document may not exist yet, so everything goes in one batch without a precondition
+        legacy_docs = await db.collection(collection).where("item_id", "==", item_id).where("user_id", "==", user_id).get()
+        await commit_writes(db, [("delete", doc.reference, None) for doc in legacy_docs])
+        return len(legacy_docs)
+    try:
+        await doc_ref.delete(option=db.write_option(exists=True))
+        return 1
+    except NotFound:
+        return 0
+
+async def migrate_to_keyed_docs(db, collection: str, counter_field: Optional[str] = None) -> Dict[str, int]:
+    """Rewrite auto-id documents in a likes-style collection to {user_id}_{item_id} IDs, dropping duplicates"""
+    docs_by_key: Dict[str, List[Any]] = {}
+    async for doc in db.collection(collection).stream():
+        doc_data = doc.to_dict()
+        if doc_data.get("user_id") and doc_data.get("item_id"):
+            docs_by_key.setdefault(f"{doc_data['user_id']}_{doc_data['item_id']}", []).append(doc)
+    
+    writes = []
+    duplicates_by_item: Dict[str, int] = {}
+    migrated = 0
+    for key, docs in docs_by_key.items():
+        legacy_docs = [doc for doc in docs if doc.id != key]
+        if not legacy_docs:
+            continue
+        if len(legacy_docs) == len(docs):
+            # set rather than create, so a rerun or a like made meanwhile doesn't fail the batch
+            oldest_doc = min(legacy_docs, key=lambda doc: doc.to_dict().get("created_at") or "")
+            writes.append(("set", db.collection(collection).document(key), oldest_doc.to_dict()))
+            migrated += 1
+        writes.extend(("delete", doc.reference, None) for doc in legacy_docs)
+        if len(docs) > 1:
+            item_id = docs[0].to_dict()["item_id"]
+            duplicates_by_item[item_id] = duplicates_by_item.get(item_id, 0) + len(docs) - 1
+    await commit_writes(db, writes)
+    
+    # Each duplicate was counted on the item, so take them back off; deleted items are skipped
+    if counter_field:
+        for item_id, duplicates in duplicates_by_item.items():
+            try:
+                await db.collection("items").document(item_id).update({counter_field: firestore.Increment(-duplicates)})
+            except NotFound:
+                pass
+    
+    return {"migrated": migrated, "duplicates_removed": sum(duplicates_by_item.values())}
+
+# Shortest word prefix indexed from item names, for search-as-you-type
+MIN_SEARCH_PREFIX = 3
+
+WORD_CHAR_PATTERN = re.compile(r"\w")
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into lowercase words, in any script"""
+    # \w is Unicode-aware but leaves out combining marks (e.g. Devanagari vowel signs), so those join words too
+    words = []
+    current = []
+    for char in (text or "").lower():
+        if WORD_CHAR_PATTERN.match(char) or unicodedata.category(char).startswith("M"):
+            current.append(char)
+        elif current:
+            words.append("".join(current))
+            current = []
+    if current:
+        words.append("".join(current))
+    return words
+
+def build_search_tokens(name: Optional[str], description: Optional[str]) -> List[str]:
+    """Build the search_tokens array stored on items: name words and their prefixes, plus description words"""
+    tokens = set(tokenize(description))
+    for word in tokenize(name):
+        tokens.update(word[:end] for end in range(MIN_SEARCH_PREFIX, len(word) + 1))
+        tokens.add(word)
+    return sorted(tokens)
+
+@firestore.async_transactional
+async def take_item_quantity(transaction, item_ref, requested_quantity: int, now: str, writes: List[tuple] = ()) -> bool:
+    """Atomically take quantity from a bulk item along with the (method, ref, data) writes that depend on it. Returns True if used up"""
+    item_doc = await item_ref.get(field_paths=["quantity"], transaction=transaction)
+    if not item_doc.exists:
+        # Raising rolls the transaction back, so none of the approval writes land
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Item not found"
+        )
+    new_quantity = (item_doc.get("quantity") or 0) - requested_quantity
+    used_up = new_quantity <= 0
+    
+    if used_up:
+        transaction.update(item_ref, {
+            "status": "donated",
+            "quantity": 0,
+            "updated_at": now
+        })
+    else:
+        transaction.update(item_ref, {
+            "quantity": new_quantity,
+            "updated_at": now
+        })
+    
+    for method, ref, data in writes:
+        getattr(transaction, method)(ref, data)
+    return used_up
+
+@lru_cache(maxsize=2)
+def tracking_id_prefix(day: date) -> str:
+    """ShareCare prefix plus the date, formatted once per day"""
+    return f"SC{day:%y%m%d}"
+
 def generate_tracking_id() -> str:
     """Generate a unique tracking ID"""
-    prefix = "SC"  # ShareCare prefix
-    timestamp = datetime.now().strftime("%y%m%d")
-    random_part = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-    return f"{prefix}{timestamp}{random_part}"
+    # 6 base32 characters (A-Z, 2-7) from the OS CSPRNG, 30 bits per day
+    random_part = base64.b32encode(secrets.token_bytes(4))[:6].decode()
+    return f"{tracking_id_prefix(date.today())}{random_part}"
 
-def create_tracking_record(db, reservation_id: str, item_id: str, donor_id: str, requester_id: str) -> str:
+def build_tracking_record(reservation_id: str, item_id: str, donor_id: str, requester_id: str) -> Dict[str, Any]:
+    """Build a new tracking record with a fresh tracking ID"""
+    now = datetime.utcnow().isoformat()
+    return {
+        "tracking_id": generate_tracking_id(),
+        "reservation_id": reservation_id,
+        "item_id": item_id,
+        "donor_id": donor_id,
+        "requester_id": requester_id,
+        "current_status": "request_accepted",
+        "status_history": [
+            {
+                "status": "request_submitted",
+                "timestamp": now,
+                "notes": "Request submitted to donor",
+                "updated_by": requester_id
+            },
+            {
+                "status": "request_accepted",
+                "timestamp": now,
+                "notes": "Request accepted by donor",
+                "updated_by": donor_id
+            }
+        ],
+        "created_at": now,
+        "updated_at": now
+    }
+
+async def create_tracking_record(db, reservation_id: str, item_id: str, donor_id: str, requester_id: str) -> str:
     """Create a new tracking record"""
     try:
-        tracking_id = generate_tracking_id()
+        tracking_data = build_tracking_record(reservation_id, item_id, donor_id, requester_id)
+        tracking_id = tracking_data["tracking_id"]
         
-        tracking_data = {
-            "tracking_id": tracking_id,
-            "reservation_id": reservation_id,
-            "item_id": item_id,
-            "donor_id": donor_id,
-            "requester_id": requester_id,
-            "current_status": "request_accepted",
-            "status_history": [
-                {
-                    "status": "request_submitted",
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "notes": "Request submitted to donor",
-                    "updated_by": requester_id
-                },
-                {
-                    "status": "request_accepted",
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "notes": "Request accepted by donor",
-                    "updated_by": donor_id
-                }
-            ],
-            "created_at": datetime.utcnow().isoformat(),
-            "updated_at": datetime.utcnow().isoformat()
-        }
-        
-        db.collection("tracking").add(tracking_data)
+        await db.collection("tracking").document(tracking_id).create(tracking_data)
         logger.info(f"Tracking record created: {tracking_id}")
         
         return tracking_id
@@ -133,7 +592,17 @@ def create_tracking_record(db, reservation_id: str, item_id: str, donor_id: str,
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create tracking record"
         )
+
+async def get_tracking_doc(db, tracking_id: str):
+    """Find the tracking record for a tracking ID, or None if there isn't one"""
+    tracking_doc = await db.collection("tracking").document(tracking_id).get()
+    if tracking_doc.exists:
+        return tracking_doc
     
+    # Records created before tracking IDs became document IDs have auto-generated IDs
+    tracking_docs = await db.collection("tracking").where("tracking_id", "==", tracking_id).limit(1).get()
+    return tracking_docs[0] if tracking_docs else None
+
 # Tracking status definitions
 TRACKING_STATUSES = {
     "request_submitted": {
@@ -178,55 +647,69 @@ TRACKING_STATUSES = {
     }
 }
 
-def update_tracking_status( db, tracking_id: str, new_status: str, notes: str = None, updated_by: str = None):
+# (title, message format) for each tracking notification, built once at import
+TRACKING_NOTIFICATION_TEMPLATES = {
+    status_key: (f"📦 {status_info['title']}", f"Tracking ID: {{tracking_id}} - {status_info['description']}")
+    for status_key, status_info in TRACKING_STATUSES.items()
+}
+
+def build_tracking_status_update(new_status: str, notes: str = None, updated_by: str = None) -> Dict[str, Any]:
+    """Build the tracking document update for a status change"""
+    now = datetime.utcnow().isoformat()
+    
+    # Add new status to history
+    new_status_entry = {
+        "status": new_status,
+        "timestamp": now,
+        "notes": notes or TRACKING_STATUSES.get(new_status, {}).get("description", ""),
+        "updated_by": updated_by
+    }
+    
+    # ArrayUnion appends server-side, so the history is never read back and concurrent updates can't drop entries
+    return {
+        "current_status": new_status,
+        "status_history": firestore.ArrayUnion([new_status_entry]),
+        "updated_at": now
+    }
+
+async def notify_tracking_status(db, tracking_id: str, new_status: str, requester_id: str):
+    """Send the tracking update notification to the requester"""
+    if new_status in TRACKING_NOTIFICATION_TEMPLATES:
+        title, message_format = TRACKING_NOTIFICATION_TEMPLATES[new_status]
+        await create_notification(
+            db=db,
+            title=
+             title,
+            message=
+            message_format.format(tracking_id=tracking_id),
+            notification_type=
+            "tracking_update",
+            isAdminNotification=False,
+            target_users=
+            [requester_id]
+        )
+
+async def update_tracking_status( db, tracking_id: str, new_status: str, notes: str = None, updated_by: str = None):
     """Update tracking status"""
     try:
         # Find tracking record
-        tracking_query = db.collection("tracking").where("tracking_id", "==", tracking_id)
-        tracking_docs = list(tracking_query.stream())
+        tracking_doc = await get_tracking_doc(db, tracking_id)
         
-        if not tracking_docs:
+        if tracking_doc is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Tracking record not found"
             )
         
-        tracking_doc = tracking_docs[0]
         tracking_data = tracking_doc.to_dict()
         
-        # Add new status to history
-        new_status_entry = {
-            "status": new_status,
-            "timestamp": datetime.utcnow().isoformat(),
-            "notes": notes or TRACKING_STATUSES.get(new_status, {}).get("description", ""),
-            "updated_by": updated_by
-        }
-        
-        status_history = tracking_data.get("status_history", [])
-        status_history.append(new_status_entry)
-        
         # Update tracking record
-        tracking_doc.reference.update({
-            "current_status": new_status,
-            "status_history": status_history,
-            "updated_at": datetime.utcnow().isoformat()
-        })
+        await tracking_doc.reference.update(
+            build_tracking_status_update(new_status, notes, updated_by)
+        )
         
         # Send notification to requester
-        if new_status in TRACKING_STATUSES:
-            status_info = TRACKING_STATUSES[new_status]
-            create_notification(
-                db=db,
-                title=
-                 f"📦 {status_info['title']}",
-                message=
-                f"Tracking ID: {tracking_id} - {status_info['description']}",
-                notification_type=
-                "tracking_update",
-                isAdminNotification=False,
-                target_users=
-                [tracking_data["requester_id"]]
-            )
+        await notify_tracking_status(db, tracking_id, new_status, tracking_data["requester_id"])
         
         logger.info(f"Tracking status updated: {tracking_id} -> {new_status}")
         
@@ -237,16 +720,17 @@ def update_tracking_status( db, tracking_id: str, new_status: str, notes: str =
             detail="Failed to update tracking status"
         )
 
-async def get_current_user_Data_from_database( db, uid: str):
-    """Get user data from database"""
+async def get_current_user_Data_from_database( db, uid: str, fields: Optional[List[str]] = None):
+    """Get user data from database, limited to the given fields if any"""
     if not db:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Database connection not available"
         )
     try:
-        user_ref = db.collection("users").document(uid)
-        user_doc = user_ref.get()
+        if not fields:
+            return await get_cached_user_profile(db, uid)
+        user_doc = await db.collection("users").document(uid).get(field_paths=fields)
         return user_doc.to_dict()
     except Exception as e:
         logger.error(f"Error getting user data from database: {e}")